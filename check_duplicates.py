@@ -4,7 +4,19 @@ Script to check for actual duplicates in the Tandoor database
 """
 
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from config import load_config
+from http_client import create_session, parse_json
+
+# Upper bound on concurrent recipe detail requests
+MAX_DETAIL_WORKERS = 16
+
+
+def _fetch_detail(session: requests.Session, url: str) -> dict:
+    """Fetch a single recipe detail, returning the parsed JSON body"""
+    response = session.get(url, timeout=10)
+    response.raise_for_status()
+    return parse_json(response)
 
 def check_for_duplicates():
     """Check if there are actual duplicate entries in Tandoor"""
@@ -16,8 +28,7 @@ def check_for_duplicates():
         print(f"❌ Config error: {e}")
         return
     
-    session = requests.Session()
-    session.headers.update({'Authorization': f'Bearer {api_token}'})
+    session = create_session(api_token)
     
     # Search for the specific recipe that might have duplicates
     search_terms = ["Sweet Habanero", "chilipeppermadness"]
@@ -34,27 +45,27 @@ def check_for_duplicates():
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = parse_json(response)
                 results = data.get('results', [])
                 
                 print(f"📊 Found {len(results)} recipes matching '{term}':")
                 
-                for recipe in results:
+                # Fetch recipe details concurrently to check source_url,
+                # reusing the same session so connections are kept alive
+                detail_urls = [f"{tandoor_url}/api/recipe/{recipe.get('id')}/" for recipe in results]
+                with ThreadPoolExecutor(max_workers=MAX_DETAIL_WORKERS) as executor:
+                    futures = [executor.submit(_fetch_detail, session, url) for url in detail_urls]
+                
+                for recipe, future in zip(results, futures):
                     recipe_id = recipe.get('id')
                     recipe_name = recipe.get('name', 'Unknown')
                     
-                    # Get detailed recipe to check source_url
                     try:
-                        detail_response = session.get(
-                            f"{tandoor_url}/api/recipe/{recipe_id}/",
-                            timeout=10
-                        )
-                        if detail_response.status_code == 200:
-                            detail = detail_response.json()
-                            source_url = detail.get('source_url', 'No source URL')
-                            print(f"   ID {recipe_id}: '{recipe_name}'")
-                            print(f"   Source: {source_url}")
-                            print()
+                        detail = future.result()
+                        source_url = detail.get('source_url', 'No source URL')
+                        print(f"   ID {recipe_id}: '{recipe_name}'")
+                        print(f"   Source: {source_url}")
+                        print()
                     except Exception as e:
                         print(f"   ID {recipe_id}: '{recipe_name}' (could not get details: {e})")
                         
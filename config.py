@@ -6,14 +6,19 @@ Handles loading, parsing, and validation of configuration files.
 
 import sys
 import configparser
+import functools
 from typing import Tuple
 from pathlib import Path
 
 from exceptions import ConfigurationError
 
 
+@functools.lru_cache(maxsize=1)
 def load_config() -> Tuple[str, str, int]:
-    """Load configuration from config.conf file with comprehensive error handling."""
+    """Load configuration from config.conf file with comprehensive error handling.
+
+    The parsed result is cached; call load_config.cache_clear() after changing config.conf.
+    """
     config = configparser.ConfigParser()
     config_path = Path(__file__).parent / 'config.conf'
 
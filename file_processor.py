@@ -4,11 +4,23 @@ File processing functionality for Tandoor Recipe Importer.
 Handles reading URL files and managing the import workflow.
 """
 
+import time
 from typing import Optional
 from pathlib import Path
 
 from exceptions import FileOperationError
 from importer import BulkImporter
+from rate_limiter import TokenBucket
+
+# Log progress every N imports (plus the first and last)
+PROGRESS_LOG_INTERVAL = 10
+
+# Adaptive pacing (AIMD): halve the import rate when rate limited (down to 1/8 of
+# the configured rate), then add back 1/8 of it after each streak of clean imports
+RATE_LIMIT_SLOWDOWN = 0.5
+MIN_RATE_FRACTION = 0.125
+RATE_RECOVERY_STEP = 0.125
+RATE_RECOVERY_STREAK = 10
 
 
 def process_url_file(
@@ -32,16 +44,40 @@ def process_url_file(
         if file_path.stat().st_size > 100 * 1024 * 1024:  # 100MB limit
             raise FileOperationError(f"File too large (>100MB): {filename}")
         
+        # Read, filter and validate URLs in a single pass
+        log_output = importer.log_output
+        is_valid_recipe_url = importer.is_valid_recipe_url
+        canonical_url = importer.canonical_url
+        stats = importer.stats
+        invalid_urls = importer.failed_urls['invalid_urls']
+        valid_urls = []
+        seen_urls = set()
+        repeated_urls = 0
+
+        # Read and decode the whole file at once (bounded by the size check above)
         with open(file_path, 'r', encoding='utf-8') as f:
-            urls = []
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if line and not line.startswith('#'):  # Skip empty lines and comments
-                    if len(line) > 2048:  # Reasonable URL length limit
-                        importer.log_output(f"⚠️ Skipping overly long URL on line {line_num}")
-                        continue
-                    urls.append(line)
-                    
+            lines = f.read().splitlines()
+
+        for line_num, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line[0] == '#':  # Skip empty lines and comments
+                continue
+            if len(line) > 2048:  # Reasonable URL length limit
+                log_output(f"⚠️ Skipping overly long URL on line {line_num}")
+                continue
+            # Validate and import each recipe only once, including redirect/category variants
+            url_key = canonical_url(line)
+            if url_key in seen_urls:
+                repeated_urls += 1
+                continue
+            seen_urls.add(url_key)
+            if is_valid_recipe_url(line):
+                valid_urls.append(line)
+            else:
+                stats['invalid_urls'] += 1
+                invalid_urls.append(line)
+                log_output(f"🚫 Skipping invalid/non-recipe URL: {line[:60]}{'...' if len(line) > 60 else ''}")
+                
     except UnicodeDecodeError as e:
         raise FileOperationError(f"File encoding error: {e}. Ensure file is UTF-8 encoded.")
     except PermissionError as e:
@@ -51,17 +87,9 @@ def process_url_file(
     except Exception as e:
         raise FileOperationError(f"Unexpected error reading file: {e}") from e
 
-    # Filter and validate URLs
-    valid_urls = []
-    for url in urls:
-        if importer.is_valid_recipe_url(url):
-            valid_urls.append(url)
-        else:
-            importer.stats['invalid_urls'] += 1
-            importer.failed_urls['invalid_urls'].append(url)
-            importer.log_output(f"🚫 Skipping invalid/non-recipe URL: {url[:60]}{'...' if len(url) > 60 else ''}")
-
     importer.log_output(f"📊 Found {len(valid_urls)} valid URLs ({importer.stats['invalid_urls']} invalid)")
+    if repeated_urls:
+        importer.log_output(f"📊 Skipped {repeated_urls} repeated URLs in file (including redirect variants)")
 
     # Apply start/limit filters
     if start_from > 0:
@@ -83,6 +111,7 @@ def process_url_file(
     importer.log_output("📊 All URLs will be processed - duplicates detected during scraping with enhanced URL pre-parsing")
     
     # Skip pre-import duplicate checking - it's unreliable for large databases
+    # (and the recipe listing does not include source_url to check against).
     # Instead rely on proper URL pre-parsing + Tandoor's duplicate detection
     new_urls = valid_urls
 
@@ -94,38 +123,61 @@ def process_url_file(
     estimated_minutes = (len(new_urls) * importer.delay) / 60
     importer.log_output(f"⏱️ Estimated time: {estimated_minutes:.1f} minutes")
 
-    # Import each URL
+    # Import each URL, starting at most one import per delay period
+    total_urls = len(new_urls)
+    base_rate = 1 / importer.delay
+    pacer = TokenBucket(rate=base_rate)
+    pacer.reserve()
+    clean_streak = 0
+    prefetched_scrape = None
     for i, url in enumerate(new_urls, 1):
-        result = importer.import_single_recipe(url, i, len(new_urls))
+        result = importer.import_single_recipe(url, i, total_urls, prefetched_scrape)
+        prefetched_scrape = None
 
         # Handle rate limiting
         if result == "rate_limited":
+            clean_streak = 0
+            pacer.set_rate(max(base_rate * MIN_RATE_FRACTION, pacer.rate * RATE_LIMIT_SLOWDOWN))
+            importer.log_output(f"🐢 Slowing down to one import every {1 / pacer.rate:.0f}s")
             importer.log_output("⏳ Hit rate limit, waiting for reset...")
             if importer.wait_for_rate_limit_reset():
                 importer.log_output("🔄 Retrying current recipe...")
-                result = importer.import_single_recipe(url, i, len(new_urls))
+                result = importer.import_single_recipe(url, i, total_urls)
             else:
                 importer.log_output("❌ Could not recover from rate limit, stopping import")
                 break
-
-        # Print progress
-        success_rate = (importer.stats['successful'] / i) * 100 if i > 0 else 0
-        progress_pct = i/len(new_urls)*100
-        importer.log_output(
-            f"📊 Progress: {i}/{len(new_urls)} ({progress_pct:.1f}%) | "
-            f"Success rate: {success_rate:.1f}%"
-        )
-        enhanced_str = f"🎯{importer.stats.get('duplicates_enhanced', 0)} " if importer.stats.get('duplicates_enhanced', 0) > 0 else ""
-        name_dup_str = f"🔄{importer.stats.get('name_duplicates', 0)} " if importer.stats.get('name_duplicates', 0) > 0 else ""
-        importer.log_output(f"📈 Stats: ✅{importer.stats['successful']} ⚠️{importer.stats['duplicates']} " + enhanced_str + name_dup_str +
-              f"🚫{importer.stats['non_recipe_urls']} 🌐{importer.stats['connection_errors']} "
-              f"❌{importer.stats['failed_scrape']+importer.stats['failed_create']} ⏳{importer.stats['rate_limited']}")
-
-        # Wait between requests (except on last one)
-        if i < len(new_urls):
-            importer.log_output(f"⏱️ Waiting {importer.delay}s before next import...")
-            import time
-            time.sleep(importer.delay)
+        else:
+            clean_streak += 1
+            if clean_streak >= RATE_RECOVERY_STREAK and pacer.rate < base_rate:
+                clean_streak = 0
+                pacer.set_rate(min(base_rate, pacer.rate + base_rate * RATE_RECOVERY_STEP))
+                importer.log_output(f"🐇 Speeding up to one import every {1 / pacer.rate:.0f}s")
+
+        # Print progress periodically
+        if i == 1 or i == total_urls or i % PROGRESS_LOG_INTERVAL == 0:
+            success_rate = (stats['successful'] / i) * 100
+            progress_pct = i/total_urls*100
+            enhanced_str = f"🎯{stats['duplicates_enhanced']} " if stats['duplicates_enhanced'] > 0 else ""
+            name_dup_str = f"🔄{stats['name_duplicates']} " if stats['name_duplicates'] > 0 else ""
+            importer.log_output(
+                f"📊 Progress: {i}/{total_urls} ({progress_pct:.1f}%) | "
+                f"Success rate: {success_rate:.1f}%\n"
+                f"📈 Stats: ✅{stats['successful']} ⚠️{stats['duplicates']} {enhanced_str}{name_dup_str}"
+                f"🚫{stats['non_recipe_urls']} 🌐{stats['connection_errors']} "
+                f"❌{stats['failed_scrape']+stats['failed_create']} ⏳{stats['rate_limited']}"
+            )
+
+        # Wait out the rest of the delay (except on last one), scraping the next recipe meanwhile
+        if i < total_urls:
+            prefetched_scrape = importer.prefetch_scrape(new_urls[i])
+            wait_time = pacer.reserve()
+            if wait_time > 0:
+                importer.log_output(f"⏱️ Waiting {wait_time:.0f}s before next import...")
+                importer.flush_output()
+                time.sleep(wait_time)
+
+    # Let background image uploads finish before reporting
+    importer.wait_for_image_uploads()
 
     # Final report
     _print_final_report(importer, new_urls)
@@ -133,62 +185,61 @@ def process_url_file(
 
 def _print_final_report(importer: BulkImporter, new_urls: list) -> None:
     """Print comprehensive final report of import results."""
-    importer.log_output("\n🎉 BULK IMPORT COMPLETE!")
-    importer.log_output("📊 Final Stats:")
-    importer.log_output(f"   Total processed: {importer.stats['total']}")
-    importer.log_output(f"   ✅ Successful imports: {importer.stats['successful']}")
-    importer.log_output(f"   ⚠️ Duplicates skipped: {importer.stats['duplicates']}")
-    if importer.stats.get('duplicates_enhanced', 0) > 0:
-        importer.log_output(f"   🎯 Duplicates enhanced with images: {importer.stats['duplicates_enhanced']}")
-    if importer.stats.get('name_duplicates', 0) > 0:
-        importer.log_output(f"   🔄 Name-based duplicates skipped: {importer.stats['name_duplicates']}")
-    importer.log_output(f"   ❌ Failed scraping: {importer.stats['failed_scrape']}")
-    importer.log_output(f"   ❌ Failed creation: {importer.stats['failed_create']}")
-    importer.log_output(f"   🚫 Non-recipe URLs: {importer.stats['non_recipe_urls']}")
-    importer.log_output(f"   🌐 Connection errors: {importer.stats['connection_errors']}")
-    importer.log_output(f"   ⏳ Rate limited: {importer.stats['rate_limited']}")
-    importer.log_output(f"   🚫 Invalid URLs: {importer.stats['invalid_urls']}")
+    out = []
+    out.append("\n🎉 BULK IMPORT COMPLETE!")
+    out.append("📊 Final Stats:")
+    out.append(f"   Total processed: {importer.stats['total']}")
+    out.append(f"   ✅ Successful imports: {importer.stats['successful']}")
+    out.append(f"   ⚠️ Duplicates skipped: {importer.stats['duplicates']}")
+    if importer.stats['duplicates_enhanced'] > 0:
+        out.append(f"   🎯 Duplicates enhanced with images: {importer.stats['duplicates_enhanced']}")
+    if importer.stats['name_duplicates'] > 0:
+        out.append(f"   🔄 Name-based duplicates skipped: {importer.stats['name_duplicates']}")
+    out.append(f"   ❌ Failed scraping: {importer.stats['failed_scrape']}")
+    out.append(f"   ❌ Failed creation: {importer.stats['failed_create']}")
+    out.append(f"   🚫 Non-recipe URLs: {importer.stats['non_recipe_urls']}")
+    out.append(f"   🌐 Connection errors: {importer.stats['connection_errors']}")
+    out.append(f"   ⏳ Rate limited: {importer.stats['rate_limited']}")
+    out.append(f"   🚫 Invalid URLs: {importer.stats['invalid_urls']}")
+    if importer.stats['failed_images'] > 0:
+        out.append(f"   🖼️ Failed image uploads: {importer.stats['failed_images']}")
 
     success_rate = (importer.stats['successful'] / max(1, len(new_urls))) * 100
-    importer.log_output(f"   📈 Success rate: {success_rate:.1f}%")
+    out.append(f"   📈 Success rate: {success_rate:.1f}%")
 
     # Display failed URLs if any
     failure_types = ['failed_scrape', 'failed_create', 'non_recipe_urls', 
                     'connection_errors', 'invalid_urls', 'name_duplicates']
-    total_failures = sum(importer.stats.get(failure_type, 0) for failure_type in failure_types)
+    total_failures = sum(importer.stats[failure_type] for failure_type in failure_types)
 
     if total_failures > 0:
-        importer.log_output(f"\n❌ FAILED URLS ({total_failures} total):")
+        out.append(f"\n❌ FAILED URLS ({total_failures} total):")
 
         if importer.failed_urls['invalid_urls']:
-            importer.log_output(f"\n🚫 Invalid URLs ({len(importer.failed_urls['invalid_urls'])}):")
-            for url in importer.failed_urls['invalid_urls']:
-                importer.log_output(f"   {url}")
+            out.append(f"\n🚫 Invalid URLs ({len(importer.failed_urls['invalid_urls'])}):")
+            out.extend(f"   {url}" for url in importer.failed_urls['invalid_urls'])
 
         if importer.failed_urls['non_recipe_urls']:
-            importer.log_output(f"\n🚫 Non-recipe URLs ({len(importer.failed_urls['non_recipe_urls'])}):")
-            for url, reason in importer.failed_urls['non_recipe_urls']:
-                importer.log_output(f"   {url} - {reason}")
+            out.append(f"\n🚫 Non-recipe URLs ({len(importer.failed_urls['non_recipe_urls'])}):")
+            out.extend(f"   {url} - {reason}" for url, reason in importer.failed_urls['non_recipe_urls'])
 
         if importer.failed_urls['connection_errors']:
-            importer.log_output(f"\n🌐 Connection errors ({len(importer.failed_urls['connection_errors'])}):")
-            for url, reason in importer.failed_urls['connection_errors']:
-                importer.log_output(f"   {url} - {reason}")
+            out.append(f"\n🌐 Connection errors ({len(importer.failed_urls['connection_errors'])}):")
+            out.extend(f"   {url} - {reason}" for url, reason in importer.failed_urls['connection_errors'])
 
         if importer.failed_urls['failed_scrape']:
-            importer.log_output(f"\n❌ Failed scraping ({len(importer.failed_urls['failed_scrape'])}):")
-            for url, reason in importer.failed_urls['failed_scrape']:
-                importer.log_output(f"   {url} - {reason}")
+            out.append(f"\n❌ Failed scraping ({len(importer.failed_urls['failed_scrape'])}):")
+            out.extend(f"   {url} - {reason}" for url, reason in importer.failed_urls['failed_scrape'])
 
         if importer.failed_urls['failed_create']:
-            importer.log_output(f"\n❌ Failed creation ({len(importer.failed_urls['failed_create'])}):")
-            for url, reason in importer.failed_urls['failed_create']:
-                importer.log_output(f"   {url} - {reason}")
+            out.append(f"\n❌ Failed creation ({len(importer.failed_urls['failed_create'])}):")
+            out.extend(f"   {url} - {reason}" for url, reason in importer.failed_urls['failed_create'])
         
         if importer.failed_urls.get('name_duplicates'):
-            importer.log_output(f"\n🔄 Name-based duplicates ({len(importer.failed_urls['name_duplicates'])}):")
-            importer.log_output("   URLs skipped due to 100% name match, please manually import if necessary:")
-            for url, reason in importer.failed_urls['name_duplicates']:
-                importer.log_output(f"   {url} - {reason}")
+            out.append(f"\n🔄 Name-based duplicates ({len(importer.failed_urls['name_duplicates'])}):")
+            out.append("   URLs skipped due to 100% name match, please manually import if necessary:")
+            out.extend(f"   {url} - {reason}" for url, reason in importer.failed_urls['name_duplicates'])
     else:
-        importer.log_output("\n✅ No failed URLs!")
\ No newline at end of file
+        out.append("\n✅ No failed URLs!")
+
+    importer.log_output("\n".join(out))
\ No newline at end of file
@@ -3,10 +3,59 @@
 Utility to find existing duplicate recipes in Tandoor database
 """
 
+import math
+import re
 import requests
-from typing import Dict, List
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, FrozenSet, List, Tuple
 from config import load_config
+from http_client import create_session, parse_json
+
+# Upper bound on concurrent page requests
+MAX_PAGE_WORKERS = 16
+
+# Minimum Jaccard similarity of name bigrams to report two names as near-duplicates
+# (one shared bigram in two, so a name plus a qualifier like "Sweet Habanero Sauce" is reported)
+NEAR_DUPLICATE_THRESHOLD = 0.5
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _normalize_name(name: str) -> str:
+    """Normalize recipe name for comparison, removing common variations"""
+    return _WHITESPACE_RE.sub(' ', name.lower().replace('recipe', '')).strip()
+
+
+def _name_shingles(normalized_name: str) -> FrozenSet[str]:
+    """Split a normalized name into word bigrams (single-word names yield the word itself)"""
+    words = normalized_name.split()
+    if len(words) < 2:
+        return frozenset(words)
+    return frozenset(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+
+def _find_near_duplicates(names: List[str], threshold: float) -> List[Tuple[str, str, float]]:
+    """Find pairs of similar names using an inverted bigram index instead of comparing all pairs"""
+    shingles = {name: _name_shingles(name) for name in names}
+
+    # Map each bigram to the names containing it
+    index: Dict[str, List[str]] = {}
+    for name, name_shingles in shingles.items():
+        for shingle in name_shingles:
+            index.setdefault(shingle, []).append(name)
+
+    pairs = []
+    for name, name_shingles in shingles.items():
+        # Only names sharing at least one bigram can be similar
+        candidates = {other for shingle in name_shingles for other in index[shingle] if other > name}
+        for other in candidates:
+            other_shingles = shingles[other]
+            similarity = len(name_shingles & other_shingles) / len(name_shingles | other_shingles)
+            if similarity >= threshold:
+                pairs.append((name, other, similarity))
+
+    return sorted(pairs, key=lambda pair: pair[2], reverse=True)
+
 
 def find_existing_duplicates():
     """Find recipes that are likely duplicates based on name similarity"""
@@ -18,39 +67,48 @@ def find_existing_duplicates():
         print(f"❌ Config error: {e}")
         return
     
-    session = requests.Session()
-    session.headers.update({'Authorization': f'Bearer {api_token}'})
+    session = create_session(api_token)
     
     print("🔍 Fetching all recipes to analyze duplicates...")
     
-    all_recipes = []
-    page = 1
-    
+    page_size = 100
+
+    def fetch_page(page: int) -> dict:
+        response = session.get(
+            f"{tandoor_url}/api/recipe/?page={page}&page_size={page_size}",
+            timeout=30
+        )
+        response.raise_for_status()
+        return parse_json(response)
+
     try:
-        while True:
-            response = session.get(
-                f"{tandoor_url}/api/recipe/?page={page}&page_size=100",
-                timeout=30
-            )
-            
-            if response.status_code != 200:
-                print(f"❌ Failed to fetch recipes: {response.status_code}")
-                return
-                
-            data = response.json()
-            results = data.get('results', [])
-            
-            if not results:
-                break
-                
-            all_recipes.extend(results)
-            print(f"   Fetched {len(all_recipes)} recipes so far...")
-            
-            if not data.get('next'):
-                break
-                
-            page += 1
+        # First page tells us the total count, remaining pages are fetched concurrently
+        first_page = fetch_page(1)
+        count = first_page.get('count', 0)
+        total_pages = math.ceil(count / page_size)
+
+        # Preallocate for the reported count and fill in place as pages arrive
+        all_recipes: List = [None] * count
+        fetched = 0
+
+        def store(results: List) -> None:
+            nonlocal fetched
+            all_recipes[fetched:fetched + len(results)] = results
+            fetched += len(results)
+            print(f"   Fetched {fetched} recipes so far...")
+
+        store(first_page.get('results', []))
+        if total_pages > 1:
+            with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as executor:
+                for data in executor.map(fetch_page, range(2, total_pages + 1)):
+                    store(data.get('results', []))
+
+        # Drop unused slots if recipes were deleted while fetching
+        del all_recipes[fetched:]
             
+    except requests.HTTPError as e:
+        print(f"❌ Failed to fetch recipes: {e.response.status_code}")
+        return
     except Exception as e:
         print(f"❌ Error fetching recipes: {e}")
         return
@@ -58,18 +116,12 @@ def find_existing_duplicates():
     print(f"📊 Total recipes in database: {len(all_recipes)}")
     
     # Group recipes by normalized name
-    name_groups: Dict[str, List] = defaultdict(list)
+    name_groups: Dict[str, List] = {}
     
     for recipe in all_recipes:
-        name = recipe.get('name', '').strip()
-        if name:
-            # Normalize name for comparison
-            normalized_name = name.lower().strip()
-            # Remove common variations
-            normalized_name = normalized_name.replace('recipe', '').strip()
-            normalized_name = normalized_name.replace('  ', ' ')
-            
-            name_groups[normalized_name].append(recipe)
+        normalized_name = _normalize_name(recipe.get('name') or '')
+        if normalized_name:
+            name_groups.setdefault(normalized_name, []).append(recipe)
     
     # Find potential duplicates
     duplicates_found = 0
@@ -86,9 +138,20 @@ def find_existing_duplicates():
             if len(recipes) > 2:
                 print(f"   ⚠️ {len(recipes)} copies found - manual cleanup recommended")
     
+    # Find similar (but not identical) names
+    print("\n🔍 Analyzing for near-duplicate recipe names...")
+    near_duplicates = _find_near_duplicates(list(name_groups), NEAR_DUPLICATE_THRESHOLD)
+    
+    for name, other, similarity in near_duplicates:
+        first, second = name_groups[name][0], name_groups[other][0]
+        print(f"\n🔎 Similar names ({similarity:.0%}):")
+        print(f"   ID {first['id']}: '{first['name']}'")
+        print(f"   ID {second['id']}: '{second['name']}'")
+    
     print("\n📊 Summary:")
     print(f"   Total recipe groups: {len(name_groups)}")
     print(f"   Duplicate groups found: {duplicates_found}")
+    print(f"   Near-duplicate pairs found: {len(near_duplicates)}")
     print(f"   Unique recipes: {len(name_groups) - duplicates_found}")
 
 if __name__ == "__main__":
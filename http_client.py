@@ -0,0 +1,63 @@
+"""
+HTTP session management for Tandoor Recipe Importer.
+
+Builds authenticated requests sessions with tuned connection pooling and retries.
+"""
+
+import json
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # Optional: faster JSON encoding/decoding for large API payloads
+except ImportError:
+    orjson = None
+
+# Sized above the default of 10 so concurrent workers never discard pooled connections
+DEFAULT_POOL_SIZE = 32
+
+DEFAULT_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504)
+)
+
+
+def create_session(
+    api_token: str,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    retry: Optional[Retry] = None
+) -> requests.Session:
+    """Create an authenticated session with a sized keep-alive connection pool."""
+    session = requests.Session()
+    session.headers.update({
+        'Authorization': f'Bearer {api_token}',
+        'Connection': 'keep-alive'
+    })
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry if retry is not None else DEFAULT_RETRY
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    return session
+
+
+def parse_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def dump_json(payload: Any) -> bytes:
+    """Encode a JSON request body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
\ No newline at end of file
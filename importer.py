@@ -4,11 +4,27 @@ Core import functionality for Tandoor Recipe Importer.
 Contains the main importer class with recipe processing logic.
 """
 
+import functools
+import itertools
+import json
+import math
+import os
+import random
+import re
 import requests
+import threading
 import time
-from typing import Optional, TextIO, Tuple, Union
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set, TextIO, Tuple, Union
+from urllib.parse import urlsplit, urlunsplit
 
 from exceptions import NetworkError, RecipeProcessingError
+from http_client import create_session, dump_json, parse_json
+from urllib3.util.retry import Retry
 from requests.exceptions import (
     RequestException, 
     Timeout, 
@@ -16,6 +32,212 @@ from requests.exceptions import (
     HTTPError
 )
 
+# Obvious non-recipe files, matched against the end of the URL path
+_SKIP_URL_SUFFIXES = (
+    # Images
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.bmp',
+    # Videos
+    '.mp4', '.mov', '.avi', '.wmv', '.flv', '.webm',
+    # Documents
+    '.pdf', '.doc', '.docx', '.txt', '.csv',
+    # Archives
+    '.zip', '.rar', '.tar', '.gz',
+)
+
+# Obvious non-recipe pages anywhere in the URL, compiled once into a single alternation
+_SKIP_URL_PATTERNS = (
+    # Social media direct links (not recipe pages)
+    'facebook.com/photo', 'instagram.com/p/', 'twitter.com/status',
+    # Youtube (handled separately by Tandoor)
+    # 'youtube.com', 'youtu.be',  # Actually, let these through as Tandoor handles them
+    # Reddit image/generic links
+    'i.redd.it', 'v.redd.it', 'reddit.com/gallery',
+    # Imgur direct images
+    'i.imgur.com',
+    # Generic file hosting
+    'dropbox.com/s/', 'drive.google.com/file',
+    # Forums/generic pages (these are harder to filter)
+)
+_SKIP_URL_RE = re.compile('|'.join(re.escape(pattern) for pattern in _SKIP_URL_PATTERNS), re.IGNORECASE)
+
+# Known domain redirects/rebrands, as (old_domain, new_canonical_domain) pairs.
+# Add other known redirects here as they're discovered, e.g.
+# ('www.olddomainname.com', 'www.newdomainname.com'),
+# ('blog.somesite.com', 'recipes.somesite.com'),
+_DOMAIN_REDIRECTS = (
+    ('www.kingarthurflour.com', 'www.kingarthurbaking.com'),
+    ('kingarthurflour.com', 'kingarthurbaking.com'),
+)
+# One case-insensitive alternation over all redirected domains (longest first, so
+# 'www.' variants win over their bare domain), rewritten via the lowercase lookup
+_DOMAIN_REDIRECT_MAP = {old_domain.lower(): new_domain for old_domain, new_domain in _DOMAIN_REDIRECTS}
+_DOMAIN_REDIRECT_RE = re.compile(
+    '|'.join(re.escape(old_domain) for old_domain in sorted(_DOMAIN_REDIRECT_MAP, key=len, reverse=True)),
+    re.IGNORECASE
+)
+
+
+def _redirect_domain(match: 're.Match[str]') -> str:
+    """Replacement for a _DOMAIN_REDIRECT_RE match: the redirected domain's new name"""
+    return _DOMAIN_REDIRECT_MAP[match.group(0).lower()]
+
+# ChiliPepperMadness.com: /chili-pepper-recipes/[category]/recipe-name/
+_CHILI_CATEGORY_RE = re.compile(r'(/chili-pepper-recipes/)[^/]+(/[^/]+/)$')
+# ChiliPepperMadness.com: recipe name with or without a category path
+_CHILI_RECIPE_NAME_RE = re.compile(r'/chili-pepper-recipes/(?:[^/]+/)?([^/]+)/?$')
+# Date-based URL paths like /2012/08/01/
+_DATE_PATH_RE = re.compile(r'/\d{4}/\d{2}/\d{2}/')
+
+# Fallback recipe names derived from a URL path segment
+_URL_NAME_SEPARATORS = str.maketrans('-_', '  ')
+_URL_NAME_SUFFIX_RE = re.compile(r'(?:\s+recipe)?(?:\.html|\.php)?$', re.IGNORECASE)
+
+# Recipe name normalization
+_NAME_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Entries kept by each URL/name normalization cache
+URL_CACHE_SIZE = 4096
+
+# Local cache of existing recipe source URLs, reused between runs while fresh
+SOURCE_URL_CACHE_FILE = Path(__file__).parent / '.existing_urls.cache'
+SOURCE_URL_CACHE_TTL = 3600  # seconds
+
+# Transport-level retries for transient failures. 429 is left to the importer's own
+# rate-limit handling, and POST is never retried so a recipe can't be created twice.
+IMPORTER_RETRY = Retry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=frozenset({'GET', 'HEAD', 'PUT'}),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# Upper bound on concurrent recipe detail requests when collecting source URLs
+SOURCE_URL_FETCH_WORKERS = 16
+
+# Full recipes kept by _fetch_recipe_by_id (least recently used are evicted first)
+RECIPE_CACHE_SIZE = 256
+
+# Background workers uploading primary images while the next recipe is imported
+IMAGE_UPLOAD_WORKERS = 4
+
+# Rate limit handling for concurrent API requests
+DEFAULT_RETRY_AFTER = 60  # seconds, when the server doesn't say
+MAX_RATE_LIMIT_RETRIES = 3  # per detail request
+RATE_LIMIT_RESET_TIMEOUT = 600  # seconds to wait for an import rate limit to reset
+RATE_LIMIT_BACKOFF_CAP = 60  # longest unhinted wait between reset checks, in seconds
+
+# Largest recipe listing page requested at once (the server may cap it lower)
+MAX_LISTING_PAGE_SIZE = 500
+
+# Upper bound on concurrent listing page requests
+LISTING_PAGE_WORKERS = 8
+
+
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
+def _normalize_url(url: str) -> str:
+    """Normalize URL to handle common redirect patterns for better duplicate detection"""
+    url = url.strip().lower()
+    
+    # Handle protocol differences
+    url = url.replace('http://', 'https://')
+    
+    # Handle common domain redirects/rebrands
+    url = _DOMAIN_REDIRECT_RE.sub(_redirect_domain, url)
+    
+    # Remove trailing slashes for consistent comparison
+    if url.endswith('/'):
+        url = url[:-1]
+    
+    return url
+
+
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
+def _url_key(url: str) -> str:
+    """Case-insensitive only where URLs are: https scheme, lowercased host, no trailing slash"""
+    try:
+        scheme, netloc, path, query, fragment = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    scheme = scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+    # Path, query and fragment keep their case (e.g. YouTube ?v= ids, shortener links)
+    return urlunsplit((scheme, netloc.lower(), path.rstrip('/'), query, fragment))
+
+
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
+def _pre_parse_url(url: str) -> Tuple[str, Tuple[str, ...]]:
+    """Rewrite URL to its canonical form, returning it with log notes describing each rewrite"""
+    notes = []
+    original_url = url.strip()
+    
+    # Handle protocol normalization
+    if original_url.startswith('http://'):
+        original_url = original_url.replace('http://', 'https://')
+    
+    # Handle known domain redirects/rebrands that should be pre-processed
+    # This prevents duplicate entries by normalizing URLs to their canonical form
+    # Replace old domains in any case, preserving case for the rest of the URL
+    match = _DOMAIN_REDIRECT_RE.search(original_url)
+    if match:
+        old_domain = match.group(0).lower()
+        original_url = _DOMAIN_REDIRECT_RE.sub(_redirect_domain, original_url)
+        notes.append(f"   🔄 Pre-parsed URL redirect: {old_domain} → {_DOMAIN_REDIRECT_MAP[old_domain]}")
+    parsed_url = original_url.lower()
+    
+    # Handle intra-site URL variations where the same recipe exists at multiple paths
+    # This prevents duplicate entries when sites organize recipes in multiple categories
+    
+    # ChiliPepperMadness.com - same recipe in multiple categories (marinades, hot-sauces, etc.)
+    if 'chilipeppermadness.com' in parsed_url and '/chili-pepper-recipes/' in parsed_url:
+        # Normalize /chili-pepper-recipes/[category]/recipe-name/ to /chili-pepper-recipes/recipe-name/
+        match = _CHILI_CATEGORY_RE.search(original_url)
+        if match:
+            canonical_url = original_url.replace(match.group(0), match.group(1) + match.group(2)[1:])
+            if canonical_url != original_url:
+                notes.append("   🔄 Pre-parsed intra-site variation: removing category path")
+                original_url = canonical_url
+    
+    # Handle common date-based URL patterns (many sites use /YYYY/MM/DD/ paths)
+    # Remove date paths like /2012/08/01/ to match how many scrapers normalize URLs
+    canonical_url = _DATE_PATH_RE.sub('/', original_url)
+    if canonical_url != original_url:
+        notes.append("   🔄 Pre-parsed date path removal: /YYYY/MM/DD/ → /")
+        original_url = canonical_url
+    
+    # Add other site-specific URL normalizations here as needed
+    # Example pattern:
+    # if 'othersite.com' in parsed_url:
+    #     # Normalize othersite.com URL variations
+    #     pass
+    
+    return original_url, tuple(notes)
+
+
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
+def _normalize_name(name: str) -> str:
+    """Normalize recipe name for duplicate comparison"""
+    # Convert to lowercase
+    normalized = name.lower()
+    
+    # Remove common punctuation and special characters
+    normalized = _NAME_PUNCTUATION_RE.sub(' ', normalized)
+    
+    # Replace multiple whitespace with single space
+    normalized = _WHITESPACE_RE.sub(' ', normalized)
+    
+    # Very conservative normalization - only basic cleanup
+    # Don't remove any words that could be meaningful recipe differentiators
+    # The goal is to catch exact duplicates, not similar recipes
+    
+    # Final cleanup
+    normalized = normalized.strip()
+    
+    return normalized
+
 
 class BulkImporter:
     """
@@ -24,22 +246,64 @@ class BulkImporter:
     Handles recipe scraping, creation, and comprehensive error handling.
     """
     
+    # Fields whose absence suggests the scrape failed
+    _CRITICAL_FIELDS = ('name', 'description', 'image_url')
+    
+    # Known problematic domains (lowercase hostnames) and why they tend to fail
+    _PROBLEMATIC_DOMAINS = {
+        'www.foodnetwork.com': 'Food Network requires special handling that Tandoor cannot provide',
+        'www.food.com': 'Food.com has anti-scraping measures',
+        'www.allrecipes.com': 'AllRecipes may have updated their structure'
+    }
+    
     def __init__(
         self, 
         tandoor_url: str, 
         api_token: str, 
         delay: int, 
-        output_file: Optional[TextIO] = None
+        output_file: Optional[TextIO] = None,
+        source_url_cache_file: Optional[Path] = None
     ):
         self.tandoor_url = tandoor_url
         self.api_token = api_token
         self.delay = delay
         self.output_file = output_file
+        self.source_url_cache_file = source_url_cache_file
+        
+        self.session = create_session(self.api_token, retry=IMPORTER_RETRY)
+        
+        # Normalized lookup index for the last existing URL set seen by _is_url_duplicate
+        self._url_index: Optional[Tuple[Set[str], Set[str]]] = None
+        self._url_index_source: Optional[Set[str]] = None
+        self._url_index_size = 0
+        
+        # Single background worker used to scrape the next recipe during the import delay;
+        # its log lines are collected per thread and replayed under that recipe's import
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=1)
+        self._log_capture = threading.local()
+        
+        # Primary image uploads for created recipes, collected by wait_for_image_uploads
+        self._image_executor = ThreadPoolExecutor(max_workers=IMAGE_UPLOAD_WORKERS)
+        self._pending_image_uploads: List[Future] = []
         
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Authorization': f'Bearer {self.api_token}'
-        })
+        # Shared cool-down so concurrent workers back off together after a 429
+        self._rate_limited_until = 0.0
+        self._rate_limit_lock = threading.Lock()
+        
+        # Retry-After hint (seconds) from the last rate limited import, if the server sent one.
+        # Only the main thread sets it; scrape and create record their 429 hint per thread,
+        # so a background prefetch can't overwrite or leak the hint the import waits on
+        self._retry_after: Optional[float] = None
+        self._last_rate_limit = threading.local()
+        
+        # Recently fetched full recipes by ID, dropped when their image changes
+        self._recipe_cache: 'OrderedDict[int, dict]' = OrderedDict()
+        self._recipe_cache_lock = threading.Lock()
+        
+        # Normalized recipe name -> recipe, loaded on the first name duplicate check
+        self._name_index: Optional[Dict[str, dict]] = None
+        self._name_index_unavailable = False
+        self._name_index_lock = threading.Lock()
         self.stats = {
             'total': 0,
             'successful': 0,
@@ -51,7 +315,8 @@ class BulkImporter:
             'rate_limited': 0,
             'invalid_urls': 0,
             'non_recipe_urls': 0,
-            'connection_errors': 0
+            'connection_errors': 0,
+            'failed_images': 0
         }
         
         # Track failed URLs with reasons
@@ -66,9 +331,17 @@ class BulkImporter:
 
     def log_output(self, message: str) -> None:
         """Output message to both console and file if specified."""
+        captured = getattr(self._log_capture, 'lines', None)
+        if captured is not None:
+            captured.append(message)
+            return
         print(message)
         if self.output_file:
             self.output_file.write(f"{message}\n")
+
+    def flush_output(self) -> None:
+        """Flush the output file, done before long waits instead of after every message"""
+        if self.output_file:
             self.output_file.flush()
 
     def is_valid_recipe_url(self, url) -> bool:
@@ -78,62 +351,29 @@ class BulkImporter:
 
         url = url.strip()
 
-        # Basic URL structure check
-        if not url.startswith(('http://', 'https://')):
+        # Basic URL structure check, cheapest tests first
+        if len(url) < 15 or not url.startswith(('http://', 'https://')) or '.' not in url:
             return False
 
-        if len(url) < 15 or '.' not in url:
+        # Skip direct links to files (one C-level check of the path ending for all extensions)
+        path = url.split('#', 1)[0].split('?', 1)[0].lower()
+        if path.endswith(_SKIP_URL_SUFFIXES):
             return False
 
-        # Skip obvious non-recipe URLs
-        skip_patterns = [
-            # Images
-            '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.bmp',
-            # Videos
-            '.mp4', '.mov', '.avi', '.wmv', '.flv', '.webm',
-            # Documents
-            '.pdf', '.doc', '.docx', '.txt', '.csv',
-            # Archives
-            '.zip', '.rar', '.tar', '.gz',
-            # Social media direct links (not recipe pages)
-            'facebook.com/photo', 'instagram.com/p/', 'twitter.com/status',
-            # Youtube (handled separately by Tandoor)
-            # 'youtube.com', 'youtu.be',  # Actually, let these through as Tandoor handles them
-            # Reddit image/generic links
-            'i.redd.it', 'v.redd.it', 'reddit.com/gallery',
-            # Imgur direct images
-            'i.imgur.com',
-            # Generic file hosting
-            'dropbox.com/s/', 'drive.google.com/file',
-            # Forums/generic pages (these are harder to filter)
-        ]
-
-        url_lower = url.lower()
-        for pattern in skip_patterns:
-            if pattern in url_lower:
-                return False
-
-        # Check for obvious recipe-related domains/paths
-        recipe_indicators = [
-            'recipe', 'cook', 'kitchen', 'food', 'allrecipes', 'foodnetwork',
-            'kingarthur', 'seriouseats', 'bonappetit', 'tasteofhome', 
-            'simplyrecipes', 'delish', 'epicurious', 'martha', 'williams-sonoma'
-        ]
-
-        # If URL contains recipe indicators, it's likely valid
-        for indicator in recipe_indicators:
-            if indicator in url_lower:
-                return True
+        # Skip obvious non-recipe pages (one case-insensitive scan for all patterns)
+        if _SKIP_URL_RE.search(url):
+            return False
 
-        # For other URLs, be more permissive and let Tandoor try to scrape
-        # Better to attempt and fail gracefully than to over-filter
+        # Anything else may be a recipe, whether or not it looks like one: be
+        # permissive and let Tandoor try to scrape. Better to attempt and fail
+        # gracefully than to over-filter
         return True
 
     def _resolve_url_redirects(self, url: str) -> str:
         """Resolve URL redirects to get the final destination URL"""
         try:
-            import requests
-            # Follow redirects to get final URL, similar to what Tandoor's scraper does
+            # Follow redirects to get final URL, similar to what Tandoor's scraper does.
+            # Not self.session: that would send the Tandoor API token to the recipe site
             response = requests.head(url, allow_redirects=True, timeout=10)
             final_url = response.url
             
@@ -147,121 +387,61 @@ class BulkImporter:
         """Normalize URL to handle common redirect patterns for better duplicate detection"""
         if not url or not isinstance(url, str):
             return url
-        
-        url = url.strip().lower()
-        
-        # Handle protocol differences
-        url = url.replace('http://', 'https://')
-        
-        # Handle common domain redirects/rebrands
-        domain_mappings = {
-            'www.kingarthurflour.com': 'www.kingarthurbaking.com',
-            'kingarthurflour.com': 'kingarthurbaking.com',
-            # Add other known domain mappings here as discovered
-        }
-        
-        for old_domain, new_domain in domain_mappings.items():
-            if old_domain in url:
-                url = url.replace(old_domain, new_domain)
-        
-        # Remove trailing slashes for consistent comparison
-        if url.endswith('/'):
-            url = url[:-1]
-        
-        return url
+        return _normalize_url(url)
 
-    def pre_parse_url(self, url: str) -> str:
+    def pre_parse_url(self, url: str, log: bool = True) -> str:
         """Pre-parse URL to handle known redirects before sending to Tandoor's duplicate checker"""
         if not url or not isinstance(url, str):
             return url
         
-        original_url = url.strip()
-        
-        # Handle protocol normalization
-        if original_url.startswith('http://'):
-            original_url = original_url.replace('http://', 'https://')
-        
-        # Handle known domain redirects/rebrands that should be pre-processed
-        # This prevents duplicate entries by normalizing URLs to their canonical form
-        redirect_mappings = {
-            'www.kingarthurflour.com': 'www.kingarthurbaking.com',
-            'kingarthurflour.com': 'kingarthurbaking.com',
-            # Add other known redirects as they're discovered
-            # Format: 'old_domain': 'new_canonical_domain'
-            # Examples of other potential redirects:
-            # 'www.olddomainname.com': 'www.newdomainname.com',
-            # 'blog.somesite.com': 'recipes.somesite.com',
-        }
-        
-        parsed_url = original_url.lower()
-        for old_domain, new_domain in redirect_mappings.items():
-            if old_domain in parsed_url:
-                # Replace the old domain with the new one, preserving case for the actual URL
-                original_url = original_url.replace(old_domain, new_domain)
-                original_url = original_url.replace(old_domain.upper(), new_domain)
-                original_url = original_url.replace(old_domain.title(), new_domain)
-                self.log_output(f"   🔄 Pre-parsed URL redirect: {old_domain} → {new_domain}")
-                break
-        
-        # Handle intra-site URL variations where the same recipe exists at multiple paths
-        # This prevents duplicate entries when sites organize recipes in multiple categories
-        
-        # ChiliPepperMadness.com - same recipe in multiple categories (marinades, hot-sauces, etc.)
-        if 'chilipeppermadness.com' in parsed_url and '/chili-pepper-recipes/' in parsed_url:
-            import re
-            # Pattern to match: /chili-pepper-recipes/[category]/recipe-name/
-            # Normalize to: /chili-pepper-recipes/recipe-name/
-            pattern = r'(/chili-pepper-recipes/)[^/]+(/[^/]+/)$'
-            match = re.search(pattern, original_url)
-            if match:
-                canonical_url = original_url.replace(match.group(0), match.group(1) + match.group(2)[1:])
-                if canonical_url != original_url:
-                    self.log_output("   🔄 Pre-parsed intra-site variation: removing category path")
-                    original_url = canonical_url
-        
-        # Handle common date-based URL patterns (many sites use /YYYY/MM/DD/ paths)
-        # Remove date paths like /2012/08/01/ to match how many scrapers normalize URLs
-        import re
-        date_pattern = r'/\d{4}/\d{2}/\d{2}/'
-        if re.search(date_pattern, original_url):
-            # Remove the date path
-            canonical_url = re.sub(date_pattern, '/', original_url)
-            if canonical_url != original_url:
-                self.log_output("   🔄 Pre-parsed date path removal: /YYYY/MM/DD/ → /")
-                original_url = canonical_url
-        
-        # Add other site-specific URL normalizations here as needed
-        # Example pattern:
-        # if 'othersite.com' in parsed_url:
-        #     # Normalize othersite.com URL variations
-        #     pass
-        
-        return original_url
+        parsed_url, notes = _pre_parse_url(url)
+        if log:
+            for note in notes:
+                self.log_output(note)
+        return parsed_url
+
+    def canonical_url(self, url: str) -> str:
+        """Comparison key for a URL: its pre-parsed form with scheme and host normalized"""
+        return _url_key(self.pre_parse_url(url, log=False))
 
     def _normalize_recipe_name(self, name: str) -> str:
         """Normalize recipe name for duplicate comparison"""
         if not name or not isinstance(name, str):
             return ""
-        
-        import re
-        
-        # Convert to lowercase
-        normalized = name.lower()
-        
-        # Remove common punctuation and special characters
-        normalized = re.sub(r'[^\w\s]', ' ', normalized)
-        
-        # Replace multiple whitespace with single space
-        normalized = re.sub(r'\s+', ' ', normalized)
-        
-        # Very conservative normalization - only basic cleanup
-        # Don't remove any words that could be meaningful recipe differentiators
-        # The goal is to catch exact duplicates, not similar recipes
-        
-        # Final cleanup
-        normalized = normalized.strip()
-        
-        return normalized
+        return _normalize_name(name)
+
+    def _load_name_index(self) -> Optional[Dict[str, dict]]:
+        """Index all existing recipes by normalized name (once), or None if the listing can't be fetched"""
+        with self._name_index_lock:
+            if self._name_index is None and not self._name_index_unavailable:
+                self.log_output("🔍 Loading existing recipe names for duplicate detection...")
+                try:
+                    name_index: Dict[str, dict] = {}
+                    page = 1
+                    while True:
+                        data = self._fetch_recipe_page(page, MAX_LISTING_PAGE_SIZE)
+                        for recipe in data.get('results', []):
+                            if isinstance(recipe, dict):
+                                normalized_name = self._normalize_recipe_name(recipe.get('name', ''))
+                                if normalized_name:
+                                    name_index.setdefault(normalized_name, recipe)
+                        if not data.get('next') or not data.get('results'):
+                            break
+                        page += 1
+                    self._name_index = name_index
+                    self.log_output(f"📊 Indexed {len(name_index)} existing recipe names")
+                except (NetworkError, RecipeProcessingError) as e:
+                    # Fall back to one search request per name check
+                    self._name_index_unavailable = True
+                    self.log_output(f"   ⚠️ Could not load recipe names, using per-recipe search: {e}")
+            return self._name_index
+
+    def _remember_recipe_name(self, recipe: dict) -> None:
+        """Add a newly created recipe to the name index so later imports see it"""
+        normalized_name = self._normalize_recipe_name(recipe.get('name', ''))
+        with self._name_index_lock:
+            if self._name_index is not None and normalized_name:
+                self._name_index.setdefault(normalized_name, recipe)
 
     def _check_name_duplicate(self, recipe_name: str) -> Tuple[bool, str, Optional[dict]]:
         """Check if a recipe with the same normalized name already exists"""
@@ -272,6 +452,13 @@ class BulkImporter:
         if not normalized_name:
             return False, "", None
         
+        name_index = self._load_name_index()
+        if name_index is not None:
+            recipe = name_index.get(normalized_name)
+            if recipe is None:
+                return False, "", None
+            return True, f"Name match found: '{recipe.get('name', '')}' (ID: {recipe.get('id', 'Unknown')})", recipe
+        
         try:
             # Search for recipes with similar names
             search_url = f"{self.tandoor_url}/api/recipe/"
@@ -284,7 +471,7 @@ class BulkImporter:
             if response.status_code != 200:
                 return False, "", None
             
-            data = response.json()
+            data = parse_json(response)
             results = data.get('results', [])
             
             for recipe in results:
@@ -303,7 +490,28 @@ class BulkImporter:
             self.log_output(f"   ⚠️ Name duplicate check failed: {e}")
             return False, "", None
 
-    def _is_url_duplicate(self, url: str, existing_urls: set) -> bool:
+    @staticmethod
+    def _recipe_slug(url: str) -> str:
+        """Extract the lowercased last path segment (the recipe name) from a URL"""
+        return urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1].lower()
+
+    def _get_url_index(self, existing_urls: Set[str]) -> Tuple[Set[str], Set[str]]:
+        """Get normalized URLs and ChiliPepperMadness recipe slugs for existing_urls, built once per URL set"""
+        # Hold the set itself (not its id, which can be reused once it is freed) and its size,
+        # so both a different set and URLs added to the same set rebuild the index
+        if (self._url_index is None or self._url_index_source is not existing_urls
+                or self._url_index_size != len(existing_urls)):
+            normalized_urls = {self._normalize_url_for_comparison(existing_url) for existing_url in existing_urls}
+            chili_slugs = {
+                self._recipe_slug(existing_url) for existing_url in existing_urls
+                if 'chilipeppermadness.com' in existing_url.lower()
+            }
+            self._url_index = (normalized_urls, chili_slugs)
+            self._url_index_source = existing_urls
+            self._url_index_size = len(existing_urls)
+        return self._url_index
+
+    def _is_url_duplicate(self, url: str, existing_urls: Set[str]) -> bool:
         """Check if URL is a duplicate, considering variations and normalizations"""
         if not existing_urls:
             return False
@@ -312,54 +520,34 @@ class BulkImporter:
         if url in existing_urls:
             return True
         
-        # Check normalized version
-        normalized_url = self._normalize_url_for_comparison(url)
-        if normalized_url in existing_urls:
-            return True
-        
-        # Check pre-parsed version (for redirects like King Arthur)
+        # Check the normalized and pre-parsed (for redirects like King Arthur) variants
+        # against both the existing URLs and their normalized forms in one pass each.
+        # CRITICAL: the normalized pre-parsed URL (where we'll actually send the request)
+        # matching any existing recipe's normalized URL handles cases like HTTP vs HTTPS
+        # variants of redirecting URLs
         pre_parsed_url = self.pre_parse_url(url)
-        if pre_parsed_url in existing_urls:
-            return True
-        
-        # Check normalized version of pre-parsed URL
-        normalized_pre_parsed = self._normalize_url_for_comparison(pre_parsed_url)
-        if normalized_pre_parsed in existing_urls:
+        candidates = {
+            self._normalize_url_for_comparison(url),
+            pre_parsed_url,
+            self._normalize_url_for_comparison(pre_parsed_url),
+        }
+        normalized_urls, chili_slugs = self._get_url_index(existing_urls)
+        if not candidates.isdisjoint(existing_urls) or not candidates.isdisjoint(normalized_urls):
             return True
         
-        # CRITICAL: Check if the pre-parsed URL (where we'll actually send the request)
-        # would result in the same final URL as any existing recipe
-        # This handles cases like HTTP vs HTTPS variants of redirecting URLs
-        for existing_url in existing_urls:
-            # If an existing URL is from the same domain as our pre-parsed URL,
-            # and they normalize to the same thing, consider it a duplicate
-            if (self._normalize_url_for_comparison(existing_url) == normalized_pre_parsed or
-                existing_url == pre_parsed_url):
-                return True
-        
         # For chilipeppermadness.com URLs, check both with and without category paths
         if 'chilipeppermadness.com' in url.lower() and '/chili-pepper-recipes/' in url:
-            import re
-            
             # If this URL has a category, check if version without category exists
-            pattern = r'(/chili-pepper-recipes/)[^/]+(/[^/]+/)$'
-            match = re.search(pattern, url)
+            match = _CHILI_CATEGORY_RE.search(url)
             if match:
                 canonical_url = url.replace(match.group(0), match.group(1) + match.group(2)[1:])
                 if canonical_url in existing_urls:
                     return True
             
             # Also check if any existing URL is a category variation of this URL
-            url_lower = url.lower()
-            for existing_url in existing_urls:
-                if 'chilipeppermadness.com' in existing_url.lower():
-                    # Extract recipe name from both URLs and compare
-                    url_recipe_name = url_lower.split('/')[-2] if url_lower.endswith('/') else url_lower.split('/')[-1]
-                    existing_recipe_name = existing_url.lower().split('/')[-2] if existing_url.lower().endswith('/') else existing_url.lower().split('/')[-1]
-                    
-                    # If recipe names match, consider it a duplicate
-                    if url_recipe_name == existing_recipe_name and len(url_recipe_name) > 5:
-                        return True
+            url_recipe_name = self._recipe_slug(url)
+            if len(url_recipe_name) > 5 and url_recipe_name in chili_slugs:
+                return True
         
         return False
 
@@ -391,48 +579,53 @@ class BulkImporter:
         """Check if two URLs represent the same recipe (for chilipeppermadness.com variations)"""
         if 'chilipeppermadness.com' in url1.lower() and 'chilipeppermadness.com' in url2.lower():
             # Extract recipe names and compare
-            name1 = url1.lower().split('/')[-2] if url1.lower().endswith('/') else url1.lower().split('/')[-1]
-            name2 = url2.lower().split('/')[-2] if url2.lower().endswith('/') else url2.lower().split('/')[-1]
+            name1 = self._recipe_slug(url1)
+            name2 = self._recipe_slug(url2)
             return name1 == name2 and len(name1) > 5
         return False
 
     def _check_recipe_exists_by_source_url(self, source_url: str) -> bool:
         """Check if a recipe with the given source URL already exists (optimized for speed)"""
         try:
-            # Quick check: only look at recent recipes to avoid timeout
+            # Ask the server to filter by source URL; servers that ignore the filter
+            # return recent recipes instead, so every match is still verified below
             response = self.session.get(
                 f"{self.tandoor_url}/api/recipe/",
-                params={'page_size': 20},  # Reduced to prevent timeouts
+                params={'source_url': source_url, 'page_size': 20},  # Reduced to prevent timeouts
                 timeout=5
             )
             
             if response.status_code != 200:
                 return False
                 
-            data = response.json()
+            data = parse_json(response)
             recipes = data.get('results', [])
+            normalized_source_url = self._normalize_url_for_comparison(source_url)
             
-            # Check each recipe's source URL by fetching details
+            # Check each recipe's source URL, fetching details only when the listing lacks it
             for recipe in recipes:
                 recipe_id = recipe.get('id')
-                if recipe_id:
+                if not recipe_id:
+                    continue
+                if 'source_url' in recipe:
+                    existing_source_url = recipe['source_url'] or ''
+                else:
                     try:
                         detail_response = self.session.get(
                             f"{self.tandoor_url}/api/recipe/{recipe_id}/",
                             timeout=3  # Shorter timeout
                         )
-                        if detail_response.status_code == 200:
-                            detail = detail_response.json()
-                            existing_source_url = detail.get('source_url', '')
-                            
-                            # Check for exact match or normalized match
-                            if (existing_source_url == source_url or
-                                self._normalize_url_for_comparison(existing_source_url) == 
-                                self._normalize_url_for_comparison(source_url)):
-                                return True
+                        if detail_response.status_code != 200:
+                            continue
+                        existing_source_url = parse_json(detail_response).get('source_url') or ''
                     except Exception as e:
                         self.log_output(f"Warning: Error parsing recipe detail during duplicate check: {e}")
                         continue
+                
+                # Check for exact match or normalized match
+                if (existing_source_url == source_url or
+                    self._normalize_url_for_comparison(existing_source_url) == normalized_source_url):
+                    return True
             
             return False
             
@@ -445,11 +638,8 @@ class BulkImporter:
         try:
             # For ChiliPepperMadness URLs, we need to check for category variations
             if 'chilipeppermadness.com' in original_url.lower() and '/chili-pepper-recipes/' in original_url:
-                import re
-                
                 # Extract the recipe name from the URL
-                pattern = r'/chili-pepper-recipes/(?:[^/]+/)?([^/]+)/?$'
-                match = re.search(pattern, original_url)
+                match = _CHILI_RECIPE_NAME_RE.search(original_url)
                 if match:
                     recipe_name = match.group(1)
                     
@@ -475,146 +665,250 @@ class BulkImporter:
             self.log_output(f"   ⚠️ Error checking URL variations: {e}")
             return False
 
-    def get_existing_source_urls(self, max_recipes: int = 500, timeout_seconds: int = 30) -> set:
-        """Get existing recipe source URLs for duplicate detection with limits to prevent timeouts."""
-        existing_urls = set()
-        page = 1
-        max_retries = 2  # Reduced retries for faster operation
-        base_delay = 1
-        recipes_fetched = 0
-        start_time = __import__('time').time()
-
-        self.log_output(f"🔍 Fetching up to {max_recipes} existing recipes (timeout: {timeout_seconds}s)...")
-
-        while recipes_fetched < max_recipes:
-            response = None
-            retry_count = 0
+    def _load_cached_source_urls(self) -> Optional[Set[str]]:
+        """Load existing source URLs from the local cache if it is fresh and for this instance"""
+        if not self.source_url_cache_file:
+            return None
+        
+        try:
+            cache_path = Path(self.source_url_cache_file)
+            if not cache_path.is_file():
+                return None
             
-            while retry_count <= max_retries:
-                try:
-                    response = self.session.get(
-                        f"{self.tandoor_url}/api/recipe/?page={page}&page_size=100", 
-                        timeout=30
-                    )
-
-                    if response.status_code == 429:
-                        retry_after = int(response.headers.get('Retry-After', 60))
-                        self.log_output(f"⏳ Rate limited while fetching existing recipes, waiting {retry_after}s...")
-                        time.sleep(retry_after)
-                        continue
+            cached = json.loads(cache_path.read_text(encoding='utf-8'))
+            if cached.get('tandoor_url') != self.tandoor_url:
+                return None
+            if time.time() - cached.get('fetched_at', 0) > SOURCE_URL_CACHE_TTL:
+                return None
+            
+            return set(cached.get('urls', []))
+            
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            self.log_output(f"⚠️ Ignoring unreadable source URL cache: {e}")
+            return None
 
-                    response.raise_for_status()
+    def _save_cached_source_urls(self, urls: Set[str]) -> None:
+        """Atomically write existing source URLs to the local cache"""
+        if not self.source_url_cache_file:
+            return
+        
+        cache_path = Path(self.source_url_cache_file)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.tmp")
+        try:
+            tmp_path.write_text(json.dumps({
+                'tandoor_url': self.tandoor_url,
+                'fetched_at': time.time(),
+                'urls': sorted(urls)
+            }), encoding='utf-8')
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            self.log_output(f"⚠️ Could not write source URL cache: {e}")
+
+    @staticmethod
+    def _retry_after_hint(response: requests.Response) -> Optional[float]:
+        """Read a 429 response's Retry-After (seconds or HTTP date) as seconds, or None if absent or unparseable"""
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def _retry_after_seconds(self, response: requests.Response) -> float:
+        """Read a 429 response's Retry-After delay in seconds, with a default if absent or unparseable"""
+        retry_after = self._retry_after_hint(response)
+        return DEFAULT_RETRY_AFTER if retry_after is None else retry_after
+
+    def _start_rate_limit_cooldown(self, response: requests.Response) -> float:
+        """Hold back all API workers until the server's Retry-After has passed, returning the delay"""
+        retry_after = self._retry_after_seconds(response)
+        with self._rate_limit_lock:
+            self._rate_limited_until = max(self._rate_limited_until, time.monotonic() + retry_after)
+        return retry_after
+
+    def _wait_for_rate_limit_cooldown(self) -> None:
+        """Sleep until any shared rate limit cool-down has passed"""
+        remaining = self._rate_limited_until - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def _fetch_recipe_source_url(self, recipe_id: int) -> Optional[str]:
+        """Fetch a single recipe's source_url, or None if it has none or the request fails"""
+        try:
+            for _ in range(MAX_RATE_LIMIT_RETRIES + 1):
+                self._wait_for_rate_limit_cooldown()
+                detail_response = self.session.get(
+                    f"{self.tandoor_url}/api/recipe/{recipe_id}/",
+                    timeout=5  # Shorter timeout for individual requests
+                )
+                if detail_response.status_code != 429:
                     break
+                self._start_rate_limit_cooldown(detail_response)
+            if detail_response.status_code == 200:
+                recipe = parse_json(detail_response)
+                # Same payload as _fetch_recipe_by_id, so keep it for duplicate enhancement
+                self._cache_recipe(recipe_id, recipe)
+                source_url = recipe.get('source_url')
+                if source_url and isinstance(source_url, str):
+                    return source_url.strip()
+        except Exception as e:
+            # Don't fail the whole process if one recipe fetch fails
+            self.log_output(f"Warning: Error fetching recipe during duplicate check: {e}")
+        return None
+
+    def _fetch_recipe_page(self, page: int, page_size: int) -> dict:
+        """Fetch one page of the recipe listing, waiting out rate limits"""
+        # Connection errors and 5xx responses are retried with backoff by the session adapter
+        while True:
+            try:
+                self._wait_for_rate_limit_cooldown()
+                response = self.session.get(
+                    f"{self.tandoor_url}/api/recipe/?page={page}&page_size={page_size}", 
+                    timeout=30
+                )
+
+                if response.status_code == 429:
+                    retry_after = self._start_rate_limit_cooldown(response)
+                    self.log_output(f"⏳ Rate limited while fetching existing recipes, waiting {retry_after:.0f}s...")
+                    continue
+
+                response.raise_for_status()
+                break
 
-                except (Timeout, ConnectionError) as e:
-                    retry_count += 1
-                    if retry_count > max_retries:
-                        raise NetworkError(f"Failed to connect to Tandoor after {max_retries} retries: {e}")
-                    
-                    wait_time = base_delay * (2 ** (retry_count - 1))  # Exponential backoff
-                    self.log_output(f"🔄 Network error (retry {retry_count}/{max_retries}), waiting {wait_time}s: {e}")
-                    time.sleep(wait_time)
-
-                except HTTPError as e:
-                    if e.response.status_code == 401:
-                        raise NetworkError("Authentication failed. Check your API token.")
-                    elif e.response.status_code == 403:
-                        raise NetworkError("Access forbidden. Check your API permissions.")
-                    elif e.response.status_code >= 500:
-                        retry_count += 1
-                        if retry_count > max_retries:
-                            raise NetworkError(f"Server error after {max_retries} retries: {e}")
-                        
-                        wait_time = base_delay * (2 ** (retry_count - 1))
-                        self.log_output(
-                            f"🔄 Server error (retry {retry_count}/{max_retries}), "
-                            f"waiting {wait_time}s: {e}"
-                        )
-                        time.sleep(wait_time)
-                    else:
-                        raise NetworkError(f"HTTP error fetching existing recipes: {e}")
+            except (Timeout, ConnectionError) as e:
+                raise NetworkError(f"Failed to connect to Tandoor: {e}")
 
-                except RequestException as e:
-                    raise NetworkError(f"Request failed while fetching existing recipes: {e}")
+            except HTTPError as e:
+                if e.response.status_code == 401:
+                    raise NetworkError("Authentication failed. Check your API token.")
+                elif e.response.status_code == 403:
+                    raise NetworkError("Access forbidden. Check your API permissions.")
+                elif e.response.status_code >= 500:
+                    raise NetworkError(f"Server error fetching existing recipes: {e}")
+                else:
+                    raise NetworkError(f"HTTP error fetching existing recipes: {e}")
 
-            # Ensure we have a valid response before proceeding
-            if response is None:
-                raise NetworkError("Failed to get valid response after retries")
+            except RequestException as e:
+                raise NetworkError(f"Request failed while fetching existing recipes: {e}")
 
-            try:
-                data = response.json()
-                results = data.get('results', [])
+        try:
+            data = parse_json(response)
+        except ValueError as e:
+            raise RecipeProcessingError(f"Invalid response format from Tandoor: {e}")
+        if not isinstance(data, dict):
+            raise RecipeProcessingError("Invalid response format from Tandoor: expected a JSON object")
+        return data
+
+    def get_existing_source_urls(self, max_recipes: int = 500, timeout_seconds: int = 30) -> Set[str]:
+        """Get existing recipe source URLs for duplicate detection with limits to prevent timeouts.
+
+        Returned as a set (original and normalized forms) so membership checks are O(1).
+        Results are reused from the local cache file, when configured, for up to an hour.
+        """
+        cached_urls = self._load_cached_source_urls()
+        if cached_urls is not None:
+            self.log_output(f"📦 Using {len(cached_urls)} cached source URLs")
+            return cached_urls
 
-                if not results:
-                    break
+        existing_urls = set()
+        page_size = max(1, min(max_recipes, MAX_LISTING_PAGE_SIZE))  # Usually a single listing request
+        recipes_fetched = 0
+        start_time = time.monotonic()
+
+        self.log_output(f"🔍 Fetching up to {max_recipes} existing recipes (timeout: {timeout_seconds}s)...")
+
+        executor = ThreadPoolExecutor(max_workers=LISTING_PAGE_WORKERS)
+        try:
+            with ThreadPoolExecutor(max_workers=SOURCE_URL_FETCH_WORKERS) as detail_executor:
+                # The first page reveals the total count and the page size the server actually
+                # honors, so the remaining pages are fetched concurrently
+                first_page = self._fetch_recipe_page(1, page_size)
+                served_page_size = len(first_page.get('results') or [])
+                total_pages = 1
+                if first_page.get('next') and served_page_size:
+                    total_pages = math.ceil(min(first_page.get('count', 0), max_recipes) / served_page_size)
+                later_pages = executor.map(
+                    functools.partial(self._fetch_recipe_page, page_size=page_size),
+                    range(2, total_pages + 1)
+                )
+
+                for data in itertools.chain([first_page], later_pages):
+                    results = data.get('results', [])
+
+                    if not results:
+                        break
 
-                # Check each recipe for source_url
-                # Note: paginated API doesn't include source_url, need detailed calls
-                for recipe in results:
-                    if not isinstance(recipe, dict):
-                        continue
-                    
                     # Check timeout
-                    if __import__('time').time() - start_time > timeout_seconds:
+                    if time.monotonic() - start_time > timeout_seconds:
                         self.log_output(f"   ⏱️ Timeout reached after {timeout_seconds}s, stopping fetch")
                         break
-                        
-                    recipe_id = recipe.get('id')
-                    if recipe_id and recipes_fetched < max_recipes:
-                        # Get detailed recipe data to access source_url field
-                        try:
-                            detail_response = self.session.get(
-                                f"{self.tandoor_url}/api/recipe/{recipe_id}/",
-                                timeout=5  # Shorter timeout for individual requests
-                            )
-                            if detail_response.status_code == 200:
-                                detail_data = detail_response.json()
-                                source_url = detail_data.get('source_url')
-                                if source_url and isinstance(source_url, str):
-                                    # Store both original and normalized URLs for comparison
-                                    original_url = source_url.strip()
-                                    normalized_url = self._normalize_url_for_comparison(original_url)
-                                    existing_urls.add(original_url)
-                                    if normalized_url != original_url:
-                                        existing_urls.add(normalized_url)
-                                recipes_fetched += 1
-                        except Exception as e:
-                            # Don't fail the whole process if one recipe fetch fails
-                            self.log_output(f"Warning: Error fetching recipe during duplicate check: {e}")
-                            continue
 
-                # Check timeout again before next page
-                if __import__('time').time() - start_time > timeout_seconds:
-                    break
-                    
-                if not data.get('next') or recipes_fetched >= max_recipes:
-                    break
-
-                page += 1
+                    recipes = [
+                        recipe for recipe in results
+                        if isinstance(recipe, dict) and recipe.get('id')
+                    ][:max_recipes - recipes_fetched]
+                    recipes_fetched += len(recipes)
+
+                    # Use source_url from the listing when the server includes it, and only
+                    # fetch details (concurrently) for recipes whose listing entry lacks it
+                    source_urls = [recipe['source_url'] for recipe in recipes if 'source_url' in recipe]
+                    missing_ids = [recipe['id'] for recipe in recipes if 'source_url' not in recipe]
+                    if missing_ids:
+                        source_urls.extend(detail_executor.map(self._fetch_recipe_source_url, missing_ids))
+
+                    # Store both original and normalized URLs for comparison, a page at a time
+                    original_urls = [
+                        source_url.strip() for source_url in source_urls
+                        if source_url and isinstance(source_url, str)
+                    ]
+                    existing_urls.update(original_urls)
+                    existing_urls.update(map(_normalize_url, original_urls))
 
-            except (ValueError, KeyError) as e:
-                raise RecipeProcessingError(f"Invalid response format from Tandoor: {e}")
+                    if recipes_fetched >= max_recipes:
+                        break
+        finally:
+            # Once the fetch stops early (timeout or enough recipes), cancel queued pages and
+            # don't wait for in-flight ones, so timeout_seconds bounds the call
+            executor.shutdown(wait=False, cancel_futures=True)
 
-        elapsed_time = __import__('time').time() - start_time
+        elapsed_time = time.monotonic() - start_time
         self.log_output(f"📊 Fetched {recipes_fetched} recipes in {elapsed_time:.1f}s, found {len(existing_urls)} source URLs")
+        self._save_cached_source_urls(existing_urls)
         return existing_urls
 
-    def scrape_recipe(self, url: str) -> Tuple[bool, Union[str, dict], Optional[list], None]:
-        """Step 1: Scrape recipe data from URL"""
+    def scrape_recipe(
+        self, 
+        url: str, 
+        enhance_duplicates: bool = True
+    ) -> Tuple[bool, Union[str, dict], Optional[list], Optional[dict]]:
+        """Step 1: Scrape recipe data from URL
+
+        With enhance_duplicates=False a duplicate is returned as "duplicate: <name>" along with
+        the raw scrape result, leaving the image enhancement to the caller.
+        """
         scrape_url = f"{self.tandoor_url}/api/recipe-from-source/"
         headers = {'Content-Type': 'application/json'}
         data = {'url': url}
 
         try:
-            response = self.session.post(scrape_url, json=data, headers=headers, timeout=30)
+            response = self.session.post(scrape_url, data=dump_json(data), headers=headers, timeout=30)
 
             if response.status_code == 429:
+                self._last_rate_limit.retry_after = self._retry_after_hint(response)
                 return False, "rate_limited", None, None
 
             if response.status_code != 200:
                 return False, f"http_{response.status_code}", None, None
 
-            result = response.json()
+            result = parse_json(response)
 
             # Check for errors
             if result.get('error'):
@@ -630,15 +924,9 @@ class BulkImporter:
             # Check for duplicates and potentially enhance them with images
             duplicates = result.get('duplicates', [])
             if duplicates:
-                duplicate_recipe = duplicates[0]
-                duplicate_name = duplicate_recipe.get('name', 'Unknown')
-                
-                # Check if we can enhance the duplicate with an image
-                enhancement_result = self._try_enhance_duplicate_recipe(duplicate_recipe, result, url)
-                if enhancement_result:
-                    return False, f"duplicate_enhanced: {duplicate_name}", None, None
-                else:
-                    return False, f"duplicate: {duplicate_name}", None, None
+                if not enhance_duplicates:
+                    return False, f"duplicate: {duplicates[0].get('name', 'Unknown')}", None, result
+                return False, self._enhance_url_duplicate(result, url), None, None
 
             # Get recipe data
             recipe_data = result.get('recipe')
@@ -665,38 +953,27 @@ class BulkImporter:
         """Validate if recipe data contains meaningful content or is the result of failed scraping"""
         try:
             # Check for completely failed scraping - multiple critical fields empty
-            critical_empty_count = 0
-            critical_fields = ['name', 'description', 'image_url']
+            critical_empty_count = sum(
+                1 for field in self._CRITICAL_FIELDS
+                if not str(recipe_data.get(field, '') or '').strip()
+            )
             
-            for field in critical_fields:
-                value = recipe_data.get(field, '')
-                if not value or not str(value).strip():
-                    critical_empty_count += 1
+            # Most critical fields present - no need to scan the steps
+            if critical_empty_count < 2:
+                return {'is_valid': True}
             
             # Check if steps contain any meaningful content
             steps = recipe_data.get('steps', [])
-            has_meaningful_steps = False
-            if steps and isinstance(steps, list):
-                for step in steps:
-                    instruction = step.get('instruction', '').strip() if isinstance(step, dict) else ''
-                    ingredients = step.get('ingredients', []) if isinstance(step, dict) else []
-                    if instruction or (ingredients and len(ingredients) > 0):
-                        has_meaningful_steps = True
-                        break
+            has_meaningful_steps = isinstance(steps, list) and any(
+                isinstance(step, dict) and (step.get('instruction', '').strip() or step.get('ingredients'))
+                for step in steps
+            )
             
             # If most critical fields are empty AND no meaningful steps, it's failed scraping
-            if critical_empty_count >= 2 and not has_meaningful_steps:
+            if not has_meaningful_steps:
                 # Determine specific failure reason
-                domain = source_url.split('/')[2] if '/' in source_url else 'unknown'
-                
-                # Known problematic domains
-                problematic_domains = {
-                    'www.foodnetwork.com': 'Food Network requires special handling that Tandoor cannot provide',
-                    'www.food.com': 'Food.com has anti-scraping measures',
-                    'www.allrecipes.com': 'AllRecipes may have updated their structure'
-                }
-                
-                reason = problematic_domains.get(domain, f'Website {domain} returned no usable recipe data')
+                domain = urlsplit(source_url).hostname or 'unknown'  # Lowercased, without port
+                reason = self._PROBLEMATIC_DOMAINS.get(domain, f'Website {domain} returned no usable recipe data')
                 
                 return {
                     'is_valid': False,
@@ -718,14 +995,11 @@ class BulkImporter:
             name = recipe_data.get('name', '').strip()
             if not name:
                 # Generate name from URL as fallback
-                from urllib.parse import urlparse
-                parsed_url = urlparse(source_url)
+                parsed_url = urlsplit(source_url)
                 path_parts = [p for p in parsed_url.path.split('/') if p and p != 'recipes']
                 if path_parts:
-                    # Use last meaningful part of URL path
-                    name = path_parts[-1].replace('-', ' ').replace('_', ' ').title()
-                    # Remove common suffixes
-                    name = name.replace('.Html', '').replace('.Php', '').replace(' Recipe', '')
+                    # Use last meaningful part of URL path, without common suffixes
+                    name = _URL_NAME_SUFFIX_RE.sub('', path_parts[-1].translate(_URL_NAME_SEPARATORS)).title()
                 else:
                     # Ultimate fallback
                     name = f"Recipe from {parsed_url.netloc}"
@@ -744,19 +1018,16 @@ class BulkImporter:
                 recipe_data['servings'] = 1
                 self.log_output("   ℹ️ Invalid servings value, defaulting to 1")
 
-            # Fix keyword name field length (Tandoor limit: 64 characters)
+            # Fix keyword name field length (Tandoor limit: 64 characters), in place
             keywords = recipe_data.get('keywords', [])
             if keywords and isinstance(keywords, list):
-                fixed_keywords = []
                 for keyword in keywords:
-                    if isinstance(keyword, dict) and 'name' in keyword:
-                        original_name = keyword.get('name', '')
+                    if isinstance(keyword, dict):
+                        original_name = keyword.get('name')
                         if isinstance(original_name, str) and len(original_name) > 64:
                             truncated_name = original_name[:61] + "..."
                             keyword['name'] = truncated_name
                             self.log_output(f"   ⚠️ Keyword name truncated: '{original_name[:30]}...' → '{truncated_name}'")
-                    fixed_keywords.append(keyword)
-                recipe_data['keywords'] = fixed_keywords
 
             return recipe_data
 
@@ -764,14 +1035,29 @@ class BulkImporter:
             self.log_output(f"   ❌ Error applying recipe data fixes: {e}")
             return None
 
+    def _cache_recipe(self, recipe_id: int, recipe: dict) -> None:
+        """Remember a full recipe fetched by ID, evicting the least recently used"""
+        with self._recipe_cache_lock:
+            self._recipe_cache[recipe_id] = recipe
+            self._recipe_cache.move_to_end(recipe_id)
+            if len(self._recipe_cache) > RECIPE_CACHE_SIZE:
+                self._recipe_cache.popitem(last=False)
+
     def _fetch_recipe_by_id(self, recipe_id: int) -> Optional[dict]:
         """Fetch full recipe data by ID to check image status"""
+        with self._recipe_cache_lock:
+            if recipe_id in self._recipe_cache:
+                self._recipe_cache.move_to_end(recipe_id)
+                return self._recipe_cache[recipe_id]
+        
         try:
             recipe_url = f"{self.tandoor_url}/api/recipe/{recipe_id}/"
             response = self.session.get(recipe_url, timeout=30)
             
             if response.status_code == 200:
-                return response.json()
+                recipe = parse_json(response)
+                self._cache_recipe(recipe_id, recipe)
+                return recipe
             else:
                 self.log_output(f"   ⚠️ Failed to fetch recipe {recipe_id}: {response.status_code}")
                 return None
@@ -780,6 +1066,16 @@ class BulkImporter:
             self.log_output(f"   ❌ Error fetching recipe {recipe_id}: {e}")
             return None
 
+    def _enhance_url_duplicate(self, scrape_result: dict, url: str) -> str:
+        """Try to enhance the duplicate Tandoor reported for a scrape, returning the duplicate failure tag"""
+        duplicate_recipe = scrape_result['duplicates'][0]
+        duplicate_name = duplicate_recipe.get('name', 'Unknown')
+        
+        # Check if we can enhance the duplicate with an image
+        if self._try_enhance_duplicate_recipe(duplicate_recipe, scrape_result, url):
+            return f"duplicate_enhanced: {duplicate_name}"
+        return f"duplicate: {duplicate_name}"
+
     def _try_enhance_duplicate_recipe(self, duplicate_recipe: dict, scrape_result: dict, source_url: str) -> bool:
         """Try to enhance existing duplicate recipe with image if it lacks one"""
         try:
@@ -791,15 +1087,17 @@ class BulkImporter:
                 self.log_output(f"   ❌ Invalid duplicate recipe ID: {duplicate_id}")
                 return False
             
-            # Fetch full recipe data to check if it has an image
-            # The duplicate data from API only has id/name - need full recipe info
-            full_recipe = self._fetch_recipe_by_id(duplicate_id)
-            if not full_recipe:
-                self.log_output(f"   ❌ Could not fetch full recipe data for ID {duplicate_id}")
-                return False
+            # Trust listing data that already shows an image; a missing or empty image
+            # may just be stale (e.g. uploaded earlier this run), so confirm with full recipe data
+            image_value = duplicate_recipe.get('image')
+            if not (image_value and isinstance(image_value, str) and image_value.strip()):
+                full_recipe = self._fetch_recipe_by_id(duplicate_id)
+                if not full_recipe:
+                    self.log_output(f"   ❌ Could not fetch full recipe data for ID {duplicate_id}")
+                    return False
+                image_value = full_recipe.get('image')
             
-            # Check if duplicate has an image using full recipe data
-            image_value = full_recipe.get('image')
+            # Check if duplicate has an image
             has_image = image_value and isinstance(image_value, str) and image_value.strip()
             
             if has_image:
@@ -826,7 +1124,7 @@ class BulkImporter:
             success = self._upload_recipe_image(duplicate_id, primary_image_url)
             if success:
                 self.log_output("   ✅ Successfully enhanced duplicate recipe with image!")
-                self.stats['duplicates_enhanced'] = self.stats.get('duplicates_enhanced', 0) + 1
+                self.stats['duplicates_enhanced'] += 1
                 return True
             else:
                 self.log_output("   ⚠️ Failed to enhance duplicate recipe with image")
@@ -848,13 +1146,14 @@ class BulkImporter:
         try:
             # The recipe_data should already contain image_url from Tandoor's scraper
             # Create recipe with the image_url already included
-            response = self.session.post(create_url, json=recipe_data, headers=headers, timeout=30)
+            response = self.session.post(create_url, data=dump_json(recipe_data), headers=headers, timeout=30)
 
             if response.status_code == 429:
+                self._last_rate_limit.retry_after = self._retry_after_hint(response)
                 return False, "rate_limited", None
 
             if response.status_code == 201:  # Created successfully
-                created_recipe = response.json()
+                created_recipe = parse_json(response)
                 recipe_id = created_recipe.get('id')
                 
                 # Upload primary image - prioritize image_url from recipe data, then images array
@@ -864,15 +1163,17 @@ class BulkImporter:
                 
                 if primary_image_url and recipe_id:
                     self.log_output(f"   📸 Uploading primary image: {primary_image_url[:60]}{'...' if len(primary_image_url) > 60 else ''}")
-                    image_success = self._upload_recipe_image(recipe_id, primary_image_url)
-                    if not image_success:
-                        self.log_output("   ⚠️ Primary image upload failed")
+                    # Upload in the background; the recipe already exists either way
+                    self._pending_image_uploads.append(
+                        self._image_executor.submit(self._upload_recipe_image, recipe_id, primary_image_url)
+                    )
                 else:
                     self.log_output("   ℹ️ No image URL found for upload")
                 
                 return True, created_recipe, recipe_id
             else:
-                return False, f"http_{response.status_code}: {response.text[:100]}", None
+                # Decode only the start of the body (error pages can be large HTML tracebacks)
+                return False, f"http_{response.status_code}: {response.content[:100].decode('utf-8', 'replace')}", None
 
         except Exception as e:
             return False, f"exception: {e}", None
@@ -893,6 +1194,9 @@ class BulkImporter:
             )
             
             if response.status_code == 200:
+                # The cached copy no longer reflects the recipe's image
+                with self._recipe_cache_lock:
+                    self._recipe_cache.pop(recipe_id, None)
                 self.log_output(f"   📸 Image uploaded successfully from {image_url[:60]}{'...' if len(image_url) > 60 else ''}")
                 return True
             else:
@@ -903,7 +1207,54 @@ class BulkImporter:
             self.log_output(f"   ⚠️ Image upload error: {e}")
             return False
 
-    def import_single_recipe(self, url: str, index: int, total: int) -> str:
+    def wait_for_image_uploads(self) -> int:
+        """Wait for background image uploads to finish, returning how many failed"""
+        pending, self._pending_image_uploads = self._pending_image_uploads, []
+        failed = sum(1 for future in pending if not future.result())
+        if failed:
+            self.stats['failed_images'] += failed
+            self.log_output(f"   ⚠️ {failed} primary image upload(s) failed")
+        return failed
+
+    def _take_rate_limit_hint(self) -> Optional[float]:
+        """Return and clear the Retry-After hint of this thread's last rate limited request"""
+        retry_after = getattr(self._last_rate_limit, 'retry_after', None)
+        self._last_rate_limit.retry_after = None
+        return retry_after
+
+    def _scrape_and_check_name(
+        self, 
+        parsed_url: str
+    ) -> Tuple[tuple, Optional[Tuple[bool, str, Optional[dict]]], List[str], Optional[float]]:
+        """Scrape a recipe and, if that succeeds, run its name-based duplicate check
+
+        Runs in the background, so log lines and any Retry-After hint are returned for the
+        import to use instead of being written out, and duplicate enhancement (an image
+        upload) is left to the import.
+        """
+        self._log_capture.lines = log_lines = []
+        try:
+            scrape = self.scrape_recipe(parsed_url, enhance_duplicates=False)
+            retry_after = self._take_rate_limit_hint()
+            scrape_success, scrape_result, _, _ = scrape
+            name_check = None
+            if scrape_success and isinstance(scrape_result, dict):
+                name_check = self._check_name_duplicate(scrape_result.get('name', 'Unknown'))
+        finally:
+            self._log_capture.lines = None
+        return scrape, name_check, log_lines, retry_after
+
+    def prefetch_scrape(self, url: str) -> Future:
+        """Start scraping and name-checking a recipe in the background so it overlaps the delay between imports"""
+        return self._prefetch_executor.submit(self._scrape_and_check_name, self.pre_parse_url(url, log=False))
+
+    def import_single_recipe(
+        self, 
+        url: str, 
+        index: int, 
+        total: int, 
+        prefetched_scrape: Optional[Future] = None
+    ) -> str:
         """Complete import process for a single recipe"""
         self.log_output(f"\n📝 [{index}/{total}] Importing: {url}")
 
@@ -917,15 +1268,31 @@ class BulkImporter:
         # SIMPLIFIED: Only check for recent duplicates to avoid performance issues
         # Rely primarily on Tandoor's duplicate detection with proper URL normalization
 
-        # Step 1: Scrape (use pre-parsed URL for redirects)
-        scrape_success, scrape_result, images, _ = self.scrape_recipe(parsed_url)
+        # Step 1: Scrape (use pre-parsed URL for redirects), reusing a prefetched result if available
+        name_check = None
+        if prefetched_scrape is not None:
+            (
+                (scrape_success, scrape_result, images, duplicate_result), name_check, log_lines, retry_after
+            ) = prefetched_scrape.result()
+            for line in log_lines:
+                self.log_output(line)
+            if duplicate_result is not None:
+                # Enhance the duplicate here rather than in the background prefetch
+                scrape_result = self._enhance_url_duplicate(duplicate_result, parsed_url)
+        else:
+            scrape_success, scrape_result, images, _ = self.scrape_recipe(parsed_url)
+            retry_after = self._take_rate_limit_hint()
         if not scrape_success:
-            if "rate_limited" in scrape_result:
+            # Failures are tagged by the prefix before the first ':' (the rest is detail,
+            # e.g. a recipe name or server message, and must not affect classification)
+            failure_tag = scrape_result.partition(':')[0]
+            if failure_tag == "rate_limited":
+                self._retry_after = retry_after
                 self.stats['rate_limited'] += 1
                 self.log_output("⏳ Rate limited during scrape")
                 return "rate_limited"
-            elif "duplicate" in scrape_result:
-                if "duplicate_enhanced" in scrape_result:
+            elif failure_tag in ("duplicate", "duplicate_enhanced"):
+                if failure_tag == "duplicate_enhanced":
                     # Duplicate was enhanced with image - count as both duplicate and enhancement
                     self.stats['duplicates'] += 1
                     self.log_output(f"✅ Enhanced duplicate: {scrape_result}")
@@ -934,12 +1301,12 @@ class BulkImporter:
                     self.stats['duplicates'] += 1
                     self.log_output(f"⚠️ Duplicate: {scrape_result}")
                     return "duplicate"
-            elif "non_recipe:" in scrape_result:
+            elif failure_tag == "non_recipe":
                 self.stats['non_recipe_urls'] += 1
                 self.failed_urls['non_recipe_urls'].append((url, scrape_result))
                 self.log_output(f"🚫 Non-recipe URL: {scrape_result}")
                 return "non_recipe"
-            elif "connection:" in scrape_result:
+            elif failure_tag == "connection":
                 self.stats['connection_errors'] += 1
                 self.failed_urls['connection_errors'].append((url, scrape_result))
                 self.log_output(f"🌐 Connection error: {scrape_result}")
@@ -962,7 +1329,9 @@ class BulkImporter:
 
         # Additional name-based duplicate check
         self.log_output(f"   🔍 Checking for name-based duplicates: '{recipe_name}'")
-        is_name_duplicate, name_match_info, duplicate_recipe = self._check_name_duplicate(recipe_name)
+        if name_check is None:
+            name_check = self._check_name_duplicate(recipe_name)
+        is_name_duplicate, name_match_info, duplicate_recipe = name_check
         
         if is_name_duplicate:
             # Try to enhance the name-based duplicate with an image (like URL duplicates)
@@ -974,8 +1343,8 @@ class BulkImporter:
                 }
                 enhancement_result = self._try_enhance_duplicate_recipe(duplicate_recipe, mock_result, url)
                 if enhancement_result:
+                    # The enhancement itself was already counted in duplicates_enhanced
                     self.stats['name_duplicates'] += 1
-                    self.stats['duplicates_enhanced'] = self.stats.get('duplicates_enhanced', 0) + 1
                     self.failed_urls['name_duplicates'].append((url, f"Name duplicate enhanced: {name_match_info}"))
                     self.log_output(f"   ✅ Enhanced name-based duplicate with image: {name_match_info}")
                     return "name_duplicate_enhanced"
@@ -994,7 +1363,8 @@ class BulkImporter:
         
         create_success, create_result, recipe_id = self.create_recipe(recipe_data, images)
         if not create_success:
-            if "rate_limited" in create_result:
+            if create_result == "rate_limited":
+                self._retry_after = self._take_rate_limit_hint()
                 self.stats['rate_limited'] += 1
                 self.log_output("⏳ Rate limited during creation")
                 return "rate_limited"
@@ -1004,29 +1374,46 @@ class BulkImporter:
                 self.log_output(f"❌ Create failed: {create_result}")
                 return "failed_create"
 
+        if isinstance(create_result, dict):
+            self._remember_recipe_name(create_result)
         self.stats['successful'] += 1
         self.log_output(f"✅ SUCCESS: '{recipe_name}' (ID: {recipe_id})")
         return "success"
 
     def wait_for_rate_limit_reset(self) -> bool:
-        """Wait for rate limit to reset"""
+        """Wait for rate limit to reset, sleeping for the server's Retry-After hint when it sent one"""
         self.log_output("⏳ Waiting for rate limit to reset...")
 
-        # Try a simple GET request to check rate limit status
-        for attempt in range(12):  # Try for up to 10 minutes
+        waited = 0.0
+        attempt = 0
+        while waited < RATE_LIMIT_RESET_TIMEOUT:
+            attempt += 1
+            if self._retry_after is not None:
+                # Sleep exactly as long as the server asked, plus jitter
+                wait_time = self._retry_after + random.uniform(0, 1)  # nosec B311
+            else:
+                # No hint: exponential backoff (2, 4, 8, ... seconds, capped)
+                wait_time = min(RATE_LIMIT_BACKOFF_CAP, 2 ** attempt)
+            wait_time = min(wait_time, RATE_LIMIT_RESET_TIMEOUT - waited)
+            self.log_output(f"⏳ Waiting {wait_time:.0f}s before checking again (attempt {attempt})")
+            self.flush_output()
+            time.sleep(wait_time)
+            waited += wait_time
+
+            # Try a simple GET request to check rate limit status
             try:
                 response = self.session.get(f"{self.tandoor_url}/api/recipe/?page_size=1", timeout=10)
 
                 if response.status_code != 429:
+                    self._retry_after = None
                     self.log_output("✅ Rate limit appears to be reset!")
                     return True
 
-                self.log_output(f"⏳ Still rate limited... waiting 30s (attempt {attempt + 1}/12)")
-                time.sleep(30)
+                self._retry_after = self._retry_after_hint(response)
+                self.log_output("⏳ Still rate limited...")
 
             except Exception as e:
                 self.log_output(f"⚠️ Error checking rate limit: {e}")
-                time.sleep(30)
 
-        self.log_output("❌ Rate limit did not reset after 10 minutes")
+        self.log_output(f"❌ Rate limit did not reset after {RATE_LIMIT_RESET_TIMEOUT // 60} minutes")
         return False
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""
+Rate limiting for Tandoor Recipe Importer.
+
+Provides a token bucket used to pace requests against the Tandoor API.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    
+    Tokens refill continuously at `rate` per second up to `capacity`. Each
+    reservation takes one token; when none are left the token is borrowed
+    and the caller is told how long to wait before using it.
+    """
+    
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError(f"Invalid rate: {rate}. Must be greater than 0.")
+        if capacity < 1:
+            raise ValueError(f"Invalid capacity: {capacity}. Must be at least 1.")
+        
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Add tokens accrued since the last update, capped at capacity"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate; tokens accrued so far are kept at the old rate"""
+        if rate <= 0:
+            raise ValueError(f"Invalid rate: {rate}. Must be greater than 0.")
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+    def reserve(self) -> float:
+        """Reserve one token and return the seconds to wait before it may be used"""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> float:
+        """Block until a token is available, returning the time waited"""
+        wait_time = self.reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
\ No newline at end of file
@@ -15,7 +15,7 @@ import logging
 from pathlib import Path
 
 from config import load_config
-from importer import BulkImporter
+from importer import BulkImporter, SOURCE_URL_CACHE_FILE
 from file_processor import process_url_file
 from exceptions import (
     ConfigurationError,
@@ -83,7 +83,10 @@ def main() -> None:
             sys.exit(1)
     
     try:
-        importer = BulkImporter(tandoor_url, api_token, delay, output_file)
+        importer = BulkImporter(
+            tandoor_url, api_token, delay, output_file,
+            source_url_cache_file=SOURCE_URL_CACHE_FILE
+        )
         
         importer.log_output("🔧 TANDOOR BULK RECIPE IMPORTER")
         importer.log_output("Engaging two-stage import process")
@@ -8,8 +8,11 @@ import os
 import tempfile
 import configparser
 import json
+import threading
+import time
 import requests
 from pathlib import Path
+from concurrent.futures import Future
 from unittest.mock import patch, MagicMock, mock_open
 from io import StringIO
 
@@ -21,15 +24,29 @@ import tandoor_importer
 from config import load_config
 from importer import BulkImporter
 from file_processor import process_url_file
+from http_client import create_session, dump_json, parse_json
+from rate_limiter import TokenBucket
+from find_existing_duplicates import (
+    NEAR_DUPLICATE_THRESHOLD, _find_near_duplicates, _normalize_name, find_existing_duplicates
+)
 from exceptions import (
     ConfigurationError, NetworkError, RecipeProcessingError, FileOperationError, TandoorImporterError
 )
 
+
+def mock_json_response(payload, status_code=200):
+    """Build a mock HTTP response carrying a JSON body"""
+    response = MagicMock(status_code=status_code)
+    response.json.return_value = payload
+    response.content = json.dumps(payload).encode('utf-8')
+    return response
+
 class TestConfigLoader:
     """Test configuration loading functionality"""
     
     def test_valid_config(self):
         """Test loading valid configuration"""
+        load_config.cache_clear()
         config_content = """
 [tandoor]
 url = https://demo.example.com
@@ -50,6 +67,7 @@ delay_between_requests = 30
     
     def test_missing_config_file(self):
         """Test handling of missing config file"""
+        load_config.cache_clear()
         with patch('pathlib.Path.exists', return_value=False):
             try:
                 load_config()
@@ -60,6 +78,7 @@ delay_between_requests = 30
     
     def test_invalid_url_format(self):
         """Test invalid URL format validation"""
+        load_config.cache_clear()
         config_content = """
 [tandoor]
 url = invalid-url
@@ -81,6 +100,7 @@ delay_between_requests = 30
     
     def test_placeholder_values(self):
         """Test detection of placeholder values"""
+        load_config.cache_clear()
         config_content = """
 [tandoor]
 url = https://your-tandoor-instance.com
@@ -100,6 +120,26 @@ delay_between_requests = 30
                 assert "Please configure your Tandoor URL" in str(e)
         print("✅ Placeholder values test passed")
 
+    def test_config_is_cached(self):
+        """Test configuration is parsed once and then served from cache"""
+        load_config.cache_clear()
+        config_content = """
+[tandoor]
+url = https://demo.example.com
+api_token = test_token_12345
+
+[import]
+delay_between_requests = 30
+"""
+        with patch('pathlib.Path.exists', return_value=True), \
+             patch('pathlib.Path.is_file', return_value=True), \
+             patch('builtins.open', mock_open(read_data=config_content)) as mock_file:
+            
+            assert load_config() == load_config()
+            assert mock_file.call_count == 1
+        load_config.cache_clear()
+        print("✅ Config caching test passed")
+
 class TestImporter:
     """Test BulkImporter functionality"""
     
@@ -144,6 +184,219 @@ class TestImporter:
             assert "test message\n" in output_file.getvalue()
         print("✅ File logging test passed")
 
+    def test_log_output_flushes_only_on_request(self):
+        """Test the output file is flushed before waits rather than after every message"""
+        output_file = MagicMock()
+        importer = BulkImporter("https://test.com", "token123", 30, output_file)  # nosec B105
+        
+        with patch('builtins.print'):
+            importer.log_output("first")
+            importer.log_output("second")
+        assert output_file.write.call_count == 2
+        output_file.flush.assert_not_called()
+        
+        importer.flush_output()
+        output_file.flush.assert_called_once()
+        print("✅ Output flushing test passed")
+
+    def test_import_uses_prefetched_scrape(self):
+        """Test a prefetched scrape result is used instead of scraping again"""
+        importer = self.setup_importer()
+        prefetched = Future()
+        prefetched.set_result(((False, "duplicate: Test Recipe", None, None), None, [], None))
+        
+        with patch.object(importer, 'scrape_recipe') as mock_scrape, \
+             patch.object(importer, 'log_output'):
+            result = importer.import_single_recipe("https://example.com/recipe", 1, 1, prefetched)
+        
+        assert result == "duplicate"
+        assert importer.stats['duplicates'] == 1
+        mock_scrape.assert_not_called()
+        print("✅ Prefetched scrape test passed")
+    
+    def test_scrape_failures_classified_by_tag(self):
+        """Test scrape failures are classified by their tag, not by words in the detail"""
+        importer = self.setup_importer()
+        cases = [
+            ("duplicate: Rate_limited Cookies", "duplicate"),
+            ("non_recipe: duplicate content detected", "non_recipe"),
+            ("Server said: duplicate key value", "failed_scrape"),
+            ("rate_limited", "rate_limited"),
+        ]
+        
+        with patch.object(importer, 'log_output'):
+            for scrape_result, expected in cases:
+                with patch.object(importer, 'scrape_recipe', return_value=(False, scrape_result, None, None)):
+                    assert importer.import_single_recipe("https://example.com/recipe", 1, 1) == expected
+        
+        print("✅ Scrape failure classification test passed")
+    
+    def test_enhanced_name_duplicate_counted_once(self):
+        """Test an enhanced name duplicate is counted once as enhanced"""
+        importer = self.setup_importer()
+        recipe = {'name': 'Pie', 'image_url': 'https://example.com/pie.jpg'}
+        prefetched = Future()
+        prefetched.set_result(((True, recipe, [], None), (True, "Name match found: 'Pie' (ID: 1)", {'id': 1, 'name': 'Pie'}), [], None))
+        
+        with patch.object(importer, '_fetch_recipe_by_id', return_value={'id': 1, 'image': None}), \
+             patch.object(importer, '_upload_recipe_image', return_value=True), \
+             patch.object(importer, 'log_output'):
+            result = importer.import_single_recipe("https://example.com/pie", 1, 1, prefetched)
+        
+        assert result == "name_duplicate_enhanced"
+        assert importer.stats['name_duplicates'] == 1
+        assert importer.stats['duplicates_enhanced'] == 1
+        
+        print("✅ Enhanced name duplicate count test passed")
+    
+    def test_prefetch_runs_name_check(self):
+        """Test the background prefetch also runs the name duplicate check"""
+        importer = self.setup_importer()
+        recipe = {'name': 'Test Recipe'}
+        name_check = (True, "Name match found: 'Test Recipe' (ID: 7)", None)
+        
+        with patch.object(importer, 'scrape_recipe', return_value=(True, recipe, [], None)), \
+             patch.object(importer, '_check_name_duplicate', return_value=name_check) as mock_check, \
+             patch.object(importer, 'log_output'):
+            prefetched = importer.prefetch_scrape("https://example.com/recipe")
+            prefetched.result()
+            result = importer.import_single_recipe("https://example.com/recipe", 1, 1, prefetched)
+        
+        assert result == "name_duplicate"
+        mock_check.assert_called_once_with('Test Recipe')  # Not repeated on the import path
+        print("✅ Prefetched name check test passed")
+    
+    def test_prefetch_logs_replayed_and_enhancement_deferred(self):
+        """Test prefetch log lines appear under their recipe and duplicates are enhanced on import"""
+        importer = self.setup_importer()
+        scrape = {
+            'recipe': {'name': 'Pie', 'image_url': 'https://example.com/pie.jpg'},
+            'images': [],
+            'duplicates': [{'id': 1, 'name': 'Pie', 'image': None}],
+        }
+        
+        with patch('requests.Session.post', return_value=mock_json_response(scrape)), \
+             patch.object(importer, '_fetch_recipe_by_id', return_value={'id': 1, 'image': None}), \
+             patch.object(importer, '_upload_recipe_image', return_value=True) as mock_upload, \
+             patch('builtins.print') as mock_print:
+            prefetched = importer.prefetch_scrape("https://example.com/pie")
+            prefetched.result()
+            mock_upload.assert_not_called()  # Not uploaded from the background thread
+            mock_print.assert_not_called()
+            
+            result = importer.import_single_recipe("https://example.com/pie", 1, 1, prefetched)
+        
+        assert result == "duplicate_enhanced"
+        mock_upload.assert_called_once_with(1, 'https://example.com/pie.jpg')
+        assert importer.stats['duplicates_enhanced'] == 1
+        printed = [call.args[0] for call in mock_print.call_args_list]
+        assert printed[0] == "\n📝 [1/1] Importing: https://example.com/pie"
+        assert "   🎯 Enhancing duplicate recipe 'Pie' (ID: 1) with image" in printed
+        
+        # Warnings from scraping and the name check are printed after the recipe's header
+        scrape = {'recipe': {'name': 'Tart', 'description': 'Fruit tart', 'servings': 0}, 'images': []}
+        
+        def fake_check_name(name):
+            importer.log_output("🔍 Loading existing recipe names for duplicate detection...")
+            return True, "Name match found: 'Tart' (ID: 2)", None
+        
+        with patch('requests.Session.post', return_value=mock_json_response(scrape)), \
+             patch.object(importer, '_check_name_duplicate', side_effect=fake_check_name), \
+             patch('builtins.print') as mock_print:
+            prefetched = importer.prefetch_scrape("https://example.com/tart")
+            prefetched.result()
+            mock_print.assert_not_called()
+            
+            result = importer.import_single_recipe("https://example.com/tart", 2, 2, prefetched)
+        
+        assert result == "name_duplicate"
+        printed = [call.args[0] for call in mock_print.call_args_list]
+        assert printed[:3] == [
+            "\n📝 [2/2] Importing: https://example.com/tart",
+            "   ℹ️ Invalid servings value, defaulting to 1",
+            "🔍 Loading existing recipe names for duplicate detection...",
+        ]
+        print("✅ Prefetch log replay test passed")
+    
+    def test_name_index_used_for_duplicate_checks(self):
+        """Test name duplicate checks use an index loaded once from the recipe listing"""
+        importer = self.setup_importer()
+        listing = mock_json_response({"results": [{"id": 5, "name": "Best Pie!"}], "next": None})
+        
+        with patch('requests.Session.get', return_value=listing) as mock_get, \
+             patch.object(importer, 'log_output'):
+            is_duplicate, info, recipe = importer._check_name_duplicate("best   pie")
+            assert is_duplicate and recipe['id'] == 5
+            assert "ID: 5" in info
+            assert importer._check_name_duplicate("Cake")[0] is False
+            
+            # Recipes created during the run are added to the index
+            importer._remember_recipe_name({"id": 9, "name": "Cake"})
+            assert importer._check_name_duplicate("cake")[0] is True
+        
+        assert mock_get.call_count == 1
+        print("✅ Name index test passed")
+    
+    def test_fallback_name_from_url(self):
+        """Test an empty recipe name is replaced with one derived from the URL"""
+        importer = self.setup_importer()
+        
+        with patch.object(importer, 'log_output'):
+            fixed = importer._apply_recipe_data_fixes({'name': ' '}, "https://example.com/recipes/best_apple-pie-recipe.html")
+            assert fixed['name'] == "Best Apple Pie"
+            fixed = importer._apply_recipe_data_fixes({'name': ''}, "https://example.com/recipes/")
+            assert fixed['name'] == "Recipe from example.com"
+            
+            # Long keyword names are truncated in place
+            keywords = [{'name': 'k' * 70}, {'name': 'short'}, 'plain']
+            fixed = importer._apply_recipe_data_fixes({'name': 'Pie', 'keywords': keywords}, "https://example.com/pie")
+            assert fixed['keywords'] is keywords
+            assert keywords == [{'name': 'k' * 61 + '...'}, {'name': 'short'}, 'plain']
+        
+        print("✅ Fallback recipe name test passed")
+    
+    def test_enhance_duplicate_skips_fetch_when_listing_has_image(self):
+        """Test duplicate enhancement only fetches the full recipe when the listing shows no image"""
+        importer = self.setup_importer()
+        scrape = {'recipe': {'image_url': 'https://example.com/image.jpg'}, 'images': []}
+        
+        with patch.object(importer, '_fetch_recipe_by_id', return_value={'id': 2, 'image': None}) as mock_fetch, \
+             patch.object(importer, '_upload_recipe_image', return_value=True) as mock_upload, \
+             patch.object(importer, 'log_output'):
+            duplicate = {'id': 1, 'name': 'Pie', 'image': 'https://tandoor/media/pie.jpg'}
+            assert not importer._try_enhance_duplicate_recipe(duplicate, scrape, "https://example.com/pie")
+            mock_fetch.assert_not_called()
+            
+            assert importer._try_enhance_duplicate_recipe({'id': 2, 'name': 'Cake', 'image': None}, scrape, "https://example.com/cake")
+            mock_fetch.assert_called_once_with(2)
+            mock_upload.assert_called_once_with(2, 'https://example.com/image.jpg')
+        
+        print("✅ Duplicate enhancement image check test passed")
+    
+    def test_recipe_quality_validation(self):
+        """Test failed scrapes are detected from empty critical fields and steps"""
+        importer = self.setup_importer()
+        url = "https://www.food.com/recipe/test"
+        
+        # Populated critical fields are valid regardless of steps
+        assert importer._validate_recipe_quality({'name': 'Pie', 'description': 'Good', 'steps': None}, url)['is_valid']
+        
+        # Empty critical fields are still valid when steps have content
+        steps = [{'instruction': ' ', 'ingredients': []}, {'instruction': '', 'ingredients': [{'amount': 1}]}]
+        assert importer._validate_recipe_quality({'name': '', 'steps': steps}, url)['is_valid']
+        
+        result = importer._validate_recipe_quality({'name': 'Pie', 'steps': [{'instruction': ' '}]}, url)
+        assert not result['is_valid']
+        assert result['reason'] == 'Food.com has anti-scraping measures'
+        
+        # Problematic domains match regardless of case or port
+        result = importer._validate_recipe_quality({}, "https://WWW.Food.com:443/recipe/test")
+        assert result['reason'] == 'Food.com has anti-scraping measures'
+        result = importer._validate_recipe_quality({}, "not a url")
+        assert result['reason'] == 'Website unknown returned no usable recipe data'
+        
+        print("✅ Recipe quality validation test passed")
+
 class TestURLValidation:
     """Test URL validation logic"""
     
@@ -161,6 +414,9 @@ class TestURLValidation:
             "https://www.seriouseats.com/recipe/pasta",
             "https://www.bonappetit.com/recipe/cake",
             "https://www.tasteofhome.com/recipes/soup",
+            # File extensions only count at the end of the path
+            "https://www.tartelette.com/recipes/docs.gz-free-bread",
+            "https://example.com/recipe?img=photo.jpg",
         ]
         
         for url in valid_urls:
@@ -182,7 +438,9 @@ class TestURLValidation:
             "short.url",
             "facebook.com/photo/123",
             "instagram.com/p/123",
-            "i.imgur.com/image.jpg"
+            "i.imgur.com/image.jpg",
+            "https://example.com/Photo.JPG?width=800",
+            "https://example.com/recipes.zip#download"
         ]
         
         for url in invalid_urls:
@@ -205,6 +463,33 @@ class TestURLValidation:
         assert not importer.is_valid_recipe_url("http://localhost")
         
         print("✅ URL validation edge cases test passed")
+    
+    def test_url_duplicate_detection(self):
+        """Test duplicate URL detection against normalized and category variants"""
+        importer = self.setup_importer()
+        existing_urls = {
+            "https://www.kingarthurbaking.com/recipes/bread/",
+            "https://www.chilipeppermadness.com/chili-pepper-recipes/habanero-sauce/",
+        }
+        
+        with patch.object(importer, 'log_output'):
+            assert importer._is_url_duplicate("http://www.kingarthurflour.com/recipes/bread", existing_urls)
+            assert (importer.pre_parse_url("http://www.KingArthurFlour.com/recipes/Bread")
+                    == "https://www.kingarthurbaking.com/recipes/Bread")  # Domain matched in any case
+            assert importer._is_url_duplicate(
+                "https://www.chilipeppermadness.com/chili-pepper-recipes/hot-sauces/habanero-sauce/", existing_urls
+            )
+            assert not importer._is_url_duplicate("https://www.kingarthurbaking.com/recipes/rolls/", existing_urls)
+            
+            # The lookup index is rebuilt when a different URL set is passed
+            assert not importer._is_url_duplicate("https://example.com/recipe", existing_urls)
+            assert importer._is_url_duplicate("http://example.com/recipe/", {"https://example.com/recipe"})
+            
+            # ...even when the new set has the same size as the previous one
+            assert not importer._is_url_duplicate("https://b.com/p", {"http://a.com/x/", "http://a.com/y/"})
+            assert importer._is_url_duplicate("https://b.com/p", {"http://b.com/p/", "http://b.com/q/"})
+        
+        print("✅ URL duplicate detection test passed")
 
 class TestFileOperations:
     """Test file operation functionality"""
@@ -233,6 +518,66 @@ class TestFileOperations:
         
         print("✅ File reading success test passed")
     
+    def test_repeated_urls_imported_once(self):
+        """Test repeated URLs in the file are only validated and imported once"""
+        importer = self.setup_importer()
+        file_content = (
+            "https://example.com/recipe1\nhttps://example.com/recipe2\nhttps://example.com/recipe1\n"
+            "http://example.com/recipe2/\n"  # Same recipe after pre-parsing and normalization
+            "HTTPS://EXAMPLE.com/recipe1\n"  # Scheme and host are case-insensitive...
+            "https://example.com/Recipe1\n"  # ...but the path is not
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ\nhttps://www.youtube.com/watch?v=DQW4W9WGXCQ\n"
+        )
+        
+        with patch('pathlib.Path.exists', return_value=True), \
+             patch('pathlib.Path.is_file', return_value=True), \
+             patch('pathlib.Path.stat') as mock_stat, \
+             patch('builtins.open', mock_open(read_data=file_content)), \
+             patch('time.sleep'):
+            
+            mock_stat.return_value.st_size = 1000
+            
+            with patch.object(importer, 'import_single_recipe', return_value="success") as mock_import, \
+                 patch.object(importer, 'prefetch_scrape'), \
+                 patch.object(importer, 'log_output'):
+                process_url_file(importer, "test.txt")
+        
+        imported = [call.args[0] for call in mock_import.call_args_list]
+        assert imported == [
+            "https://example.com/recipe1", "https://example.com/recipe2", "https://example.com/Recipe1",
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "https://www.youtube.com/watch?v=DQW4W9WGXCQ",
+        ]
+        assert importer.stats['total'] == 5
+        print("✅ Repeated URLs test passed")
+    
+    def test_pacing_recovers_additively_after_rate_limit(self):
+        """Test the import rate is halved on a rate limit and then raised in small steps"""
+        importer = self.setup_importer()
+        file_content = "".join(f"https://example.com/recipe{i}\n" for i in range(21))
+        results = ["rate_limited"] + ["success"] * 21
+        
+        with patch('pathlib.Path.exists', return_value=True), \
+             patch('pathlib.Path.is_file', return_value=True), \
+             patch('pathlib.Path.stat') as mock_stat, \
+             patch('builtins.open', mock_open(read_data=file_content)), \
+             patch('time.sleep'):
+            
+            mock_stat.return_value.st_size = 1000
+            
+            with patch.object(importer, 'import_single_recipe', side_effect=results), \
+                 patch.object(importer, 'wait_for_rate_limit_reset', return_value=True), \
+                 patch.object(importer, 'prefetch_scrape'), \
+                 patch.object(importer, 'log_output') as mock_log:
+                process_url_file(importer, "test.txt")
+        
+        messages = [call.args[0] for call in mock_log.call_args_list]
+        assert "🐢 Slowing down to one import every 60s" in messages
+        # 1/60 + 1/240 = 1/48, then + 1/240 = 1/40 imports per second
+        assert "🐇 Speeding up to one import every 48s" in messages
+        assert "🐇 Speeding up to one import every 40s" in messages
+        
+        print("✅ Additive pacing recovery test passed")
+    
     def test_file_not_found(self):
         """Test file not found error"""
         importer = self.setup_importer()
@@ -271,33 +616,221 @@ class TestNetworkOperations:
         return BulkImporter("https://test.com", "token", 30)  # nosec B105
     
     def test_network_retry_logic(self):
-        """Test network retry with exponential backoff"""
+        """Test network retry with exponential backoff is handled by the session adapter"""
         importer = self.setup_importer()
         
-        # Mock a connection error followed by success
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"results": [], "next": None}
+        retry = importer.session.get_adapter("https://test.com").max_retries
+        assert retry.total == 3
+        assert retry.backoff_factor == 1
+        assert 503 in retry.status_forcelist
+        assert 429 not in retry.status_forcelist  # Rate limits are handled by the importer
+        assert 'POST' not in retry.allowed_methods  # Never create a recipe twice
         
-        with patch('requests.Session.get') as mock_get, \
+        # Errors that survive the adapter's retries are surfaced without further retrying
+        with patch('requests.Session.get', side_effect=requests.ConnectionError("Connection failed")) as mock_get, \
              patch('time.sleep') as mock_sleep, \
              patch.object(importer, 'log_output'):
             
-            # First call fails, second succeeds
-            mock_get.side_effect = [
-                requests.ConnectionError("Connection failed"),
-                mock_response
-            ]
+            try:
+                importer.get_existing_source_urls()
+                assert False, "Should have raised NetworkError"
+            except NetworkError as e:
+                assert "Failed to connect" in str(e)
             
+            assert mock_get.call_count == 1
+            mock_sleep.assert_not_called()
+        
+        print("✅ Network retry logic test passed")
+    
+    def test_source_url_cache(self):
+        """Test existing source URLs are cached on disk and reused while fresh"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file = Path(tmp_dir) / 'urls.cache'
+            importer = BulkImporter("https://test.com", "token", 30, source_url_cache_file=cache_file)  # nosec B105
+            
+            mock_list = mock_json_response({"results": [{"id": 1}], "next": None})
+            mock_detail = mock_json_response({"id": 1, "source_url": "https://example.com/recipe"})
+            
+            with patch('requests.Session.get', side_effect=[mock_list, mock_detail]) as mock_get, \
+                 patch.object(importer, 'log_output'):
+                first = importer.get_existing_source_urls()
+                second = importer.get_existing_source_urls()
+            
+            assert "https://example.com/recipe" in first
+            assert second == first
+            assert mock_get.call_count == 2  # Second call served from cache
+            
+            # A cache written for another instance is ignored
+            other = BulkImporter("https://other.com", "token", 30, source_url_cache_file=cache_file)  # nosec B105
+            assert other._load_cached_source_urls() is None
+        
+        print("✅ Source URL cache test passed")
+    
+    def test_source_urls_from_listing(self):
+        """Test source URLs in the listing are used without per-recipe detail requests"""
+        importer = self.setup_importer()
+        
+        mock_list = mock_json_response({
+            "results": [
+                {"id": 1, "source_url": "https://example.com/one"},
+                {"id": 2, "source_url": None},
+                {"id": 3},
+            ],
+            "next": None
+        })
+        mock_detail = mock_json_response({"id": 3, "source_url": "https://example.com/three"})
+        
+        with patch('requests.Session.get', side_effect=[mock_list, mock_detail]) as mock_get, \
+             patch.object(importer, 'log_output'):
             result = importer.get_existing_source_urls()
+        
+        assert {"https://example.com/one", "https://example.com/three"} <= result
+        assert mock_get.call_count == 2  # Only recipe 3 needed a detail request
+        assert mock_get.call_args_list[1][0][0] == "https://test.com/api/recipe/3/"
+        
+        print("✅ Source URLs from listing test passed")
+    
+    def test_source_url_pages_fetched_concurrently(self):
+        """Test remaining listing pages are derived from the first page's count"""
+        importer = self.setup_importer()
+        
+        def listing(url, **kwargs):
+            # Server caps pages at 100 recipes regardless of the requested page_size
+            page = int(url.split('page=')[1].split('&')[0])
+            ids = range((page - 1) * 100 + 1, min(page * 100, 250) + 1)
+            return mock_json_response({
+                "count": 250,
+                "next": "more" if page < 3 else None,
+                "results": [{"id": i, "source_url": f"https://example.com/{i}"} for i in ids]
+            })
+        
+        with patch('requests.Session.get', side_effect=listing) as mock_get, \
+             patch.object(importer, 'log_output'):
+            result = importer.get_existing_source_urls(max_recipes=250)
+        
+        assert mock_get.call_count == 3
+        assert all(f"https://example.com/{i}" in result for i in range(1, 251))
+        
+        print("✅ Concurrent source URL pages test passed")
+    
+    def test_source_url_fetch_timeout_skips_pending_pages(self):
+        """Test hitting the timeout returns without waiting for the remaining listing pages"""
+        importer = self.setup_importer()
+        release = threading.Event()
+        fetched_pages = []
+        
+        def fetch_page(page, page_size):
+            fetched_pages.append(page)
+            if page > 2:
+                release.wait(5)  # Later pages hang until the test releases them
+            ids = range((page - 1) * 100 + 1, page * 100 + 1)
+            return {"count": 5000, "next": "more",
+                    "results": [{"id": i, "source_url": f"https://example.com/{i}"} for i in ids]}
+        
+        clock = iter([0, 0])  # start time and the first page's timeout check
+        try:
+            with patch.object(importer, '_fetch_recipe_page', side_effect=fetch_page), \
+                 patch('importer.time.monotonic', side_effect=lambda: next(clock, 100)), \
+                 patch.object(importer, 'log_output') as mock_log:
+                started = time.perf_counter()
+                result = importer.get_existing_source_urls(max_recipes=5000, timeout_seconds=30)
+                elapsed = time.perf_counter() - started
+        finally:
+            release.set()
+        
+        assert elapsed < 2
+        assert "https://example.com/100" in result
+        assert "https://example.com/101" not in result
+        assert len(fetched_pages) < 50
+        assert any("Timeout reached" in str(call) for call in mock_log.call_args_list)
+        
+        print("✅ Source URL fetch timeout test passed")
+    
+    def test_rate_limited_detail_retried_after_cooldown(self):
+        """Test a rate limited detail request waits out Retry-After and is retried"""
+        importer = self.setup_importer()
+        
+        rate_limited = mock_json_response({}, status_code=429)
+        rate_limited.headers = {'Retry-After': '2'}
+        detail = mock_json_response({"id": 1, "source_url": "https://example.com/recipe"})
+        
+        with patch('requests.Session.get', side_effect=[rate_limited, detail]) as mock_get, \
+             patch('time.sleep') as mock_sleep, \
+             patch.object(importer, 'log_output'):
+            source_url = importer._fetch_recipe_source_url(1)
+        
+        assert source_url == "https://example.com/recipe"
+        assert mock_get.call_count == 2
+        mock_sleep.assert_called_once()
+        assert 0 < mock_sleep.call_args[0][0] <= 2
+        
+        print("✅ Rate limited detail retry test passed")
+    
+    def test_recipe_fetch_cached_until_image_upload(self):
+        """Test full recipes are cached by ID and refetched after their image changes"""
+        importer = self.setup_importer()
+        recipe = mock_json_response({"id": 7, "name": "Test Recipe", "image": None})
+        
+        with patch('requests.Session.get', return_value=recipe) as mock_get, \
+             patch('requests.Session.put', return_value=MagicMock(status_code=200)), \
+             patch.object(importer, 'log_output'):
+            assert importer._fetch_recipe_by_id(7)['name'] == "Test Recipe"
+            assert importer._fetch_recipe_by_id(7)['name'] == "Test Recipe"
+            assert mock_get.call_count == 1
             
-            # Should have made 2 calls (1 failed, 1 success)
+            assert importer._upload_recipe_image(7, "https://example.com/image.jpg")
+            importer._fetch_recipe_by_id(7)
             assert mock_get.call_count == 2
-            # Should have slept once (after first failure)
-            mock_sleep.assert_called_once_with(1)  # First retry delay
-            assert isinstance(result, set)
+            
+            # Details fetched while collecting source URLs are reused too
+            importer._fetch_recipe_source_url(8)
+            importer._fetch_recipe_by_id(8)
+            assert mock_get.call_count == 3
         
-        print("✅ Network retry logic test passed")
+        print("✅ Recipe fetch cache test passed")
+    
+    def test_rate_limit_reset_honors_retry_after(self):
+        """Test the rate limit wait uses the server's Retry-After, else exponential backoff"""
+        importer = self.setup_importer()
+        
+        rate_limited = mock_json_response({}, status_code=429)
+        rate_limited.headers = {'Retry-After': '5'}
+        still_limited = mock_json_response({}, status_code=429)
+        still_limited.headers = {}
+        
+        with patch('requests.Session.post', return_value=rate_limited), \
+             patch('requests.Session.get', side_effect=[mock_json_response({})]), \
+             patch('time.sleep') as mock_sleep, \
+             patch.object(importer, 'log_output'):
+            assert importer.import_single_recipe("https://example.com/recipe", 1, 1) == "rate_limited"
+            assert importer.wait_for_rate_limit_reset() is True
+        
+        mock_sleep.assert_called_once()
+        assert 5 <= mock_sleep.call_args[0][0] <= 6  # Hint plus jitter
+        
+        # A prefetched scrape's 429 hint travels with its result instead of being shared
+        rate_limited.headers = {'Retry-After': '7'}
+        with patch('requests.Session.post', return_value=rate_limited), \
+             patch('requests.Session.get', side_effect=[mock_json_response({})]), \
+             patch('time.sleep') as mock_sleep, \
+             patch.object(importer, 'log_output'):
+            prefetched = importer.prefetch_scrape("https://example.com/recipe")
+            assert prefetched.result()[3] == 7.0
+            assert importer._retry_after is None  # Not touched from the background thread
+            assert importer._take_rate_limit_hint() is None  # Nor left on the main thread
+            assert importer.import_single_recipe("https://example.com/recipe", 1, 1, prefetched) == "rate_limited"
+            assert importer._retry_after == 7.0
+            assert importer.wait_for_rate_limit_reset() is True
+        
+        assert 7 <= mock_sleep.call_args[0][0] <= 8
+        
+        with patch('requests.Session.get', side_effect=[still_limited, still_limited, mock_json_response({})]), \
+             patch('time.sleep') as mock_sleep, \
+             patch.object(importer, 'log_output'):
+            assert importer.wait_for_rate_limit_reset() is True
+        
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [2, 4, 8]
+        print("✅ Rate limit reset test passed")
     
     def test_authentication_error(self):
         """Test authentication error handling"""
@@ -324,9 +857,7 @@ class TestNetworkOperations:
         importer = self.setup_importer()
         
         # Mock successful recipe creation
-        mock_create_response = MagicMock()
-        mock_create_response.status_code = 201
-        mock_create_response.json.return_value = {'id': 123, 'name': 'Test Recipe'}
+        mock_create_response = mock_json_response({'id': 123, 'name': 'Test Recipe'}, status_code=201)
         
         # Mock successful image upload  
         mock_image_response = MagicMock()
@@ -345,7 +876,8 @@ class TestNetworkOperations:
             assert success is True
             assert recipe_id == 123
             
-            # Verify image upload was attempted
+            # Verify image upload was attempted in the background
+            assert importer.wait_for_image_uploads() == 0
             mock_put.assert_called_once()
             call_args = mock_put.call_args
             assert 'image/' in call_args[0][0]  # URL contains 'image/'
@@ -354,6 +886,175 @@ class TestNetworkOperations:
             assert call_args[1]['files']['image_url'][1] == 'https://example.com/image.jpg'
             
         print("✅ Image upload functionality test passed")
+    
+    def test_failed_background_image_uploads_counted(self):
+        """Test background image upload failures are counted once uploads finish"""
+        importer = self.setup_importer()
+        
+        mock_create_response = mock_json_response({'id': 123, 'name': 'Test Recipe'}, status_code=201)
+        mock_image_response = MagicMock()
+        mock_image_response.status_code = 500
+        
+        with patch('requests.Session.post', return_value=mock_create_response), \
+             patch('requests.Session.put', return_value=mock_image_response), \
+             patch.object(importer, 'log_output'):
+            for _ in range(2):
+                success, _, _ = importer.create_recipe({'name': 'Test Recipe', 'image_url': 'https://example.com/image.jpg'})
+                assert success is True
+            
+            assert importer.wait_for_image_uploads() == 2
+            assert importer.stats['failed_images'] == 2
+            assert importer.wait_for_image_uploads() == 0
+        
+        print("✅ Background image upload failure test passed")
+    
+    def test_create_failure_reports_body_prefix(self):
+        """Test a failed create reports the status and only the start of the response body"""
+        importer = self.setup_importer()
+        
+        mock_response = MagicMock(status_code=500)
+        mock_response.content = b"<html>Server Error" + b"x" * 100000
+        
+        with patch('requests.Session.post', return_value=mock_response):
+            success, result, recipe_id = importer.create_recipe({'name': 'Test Recipe'})
+        
+        assert success is False
+        assert recipe_id is None
+        assert result == "http_500: <html>Server Error" + "x" * 82
+        
+        print("✅ Create failure body prefix test passed")
+
+    def test_session_connection_pool(self):
+        """Test shared session mounts a sized, retrying connection pool"""
+        session = create_session("token123", pool_size=24)  # nosec B105
+        
+        assert session.headers['Authorization'] == 'Bearer token123'
+        for prefix in ('https://', 'http://'):
+            adapter = session.get_adapter(f"{prefix}test.com")
+            assert adapter._pool_maxsize == 24
+            assert adapter.max_retries.total == 3
+            assert 429 in adapter.max_retries.status_forcelist
+        
+        print("✅ Session connection pool test passed")
+    
+    def test_json_body_round_trip(self):
+        """Test request bodies encode to JSON bytes that decode back unchanged"""
+        payload = {'name': 'Crème brûlée', 'steps': [{'instruction': 'Bake', 'ingredients': [{'amount': 0.5}]}]}
+        body = dump_json(payload)
+        
+        assert isinstance(body, bytes)
+        assert json.loads(body) == payload
+        assert parse_json(mock_json_response(payload)) == payload
+        
+        print("✅ JSON body round trip test passed")
+
+class TestRateLimiter:
+    """Test token bucket rate limiting"""
+    
+    def test_token_bucket_pacing(self):
+        """Test reservations are spaced by the refill rate"""
+        with patch('time.monotonic', return_value=100.0) as mock_clock:
+            bucket = TokenBucket(rate=0.5)  # One token every 2 seconds
+            
+            assert bucket.reserve() == 0.0  # Starts full
+            assert bucket.reserve() == 2.0
+            assert bucket.reserve() == 4.0  # Reservations queue up
+            
+            mock_clock.return_value = 110.0  # Time spent working counts toward the wait
+            assert bucket.reserve() == 0.0
+        
+        print("✅ Token bucket pacing test passed")
+    
+    def test_token_bucket_set_rate(self):
+        """Test changing the rate slows down and speeds up later reservations"""
+        with patch('time.monotonic', return_value=100.0):
+            bucket = TokenBucket(rate=0.5)
+            bucket.reserve()
+            
+            bucket.set_rate(0.25)  # Back off to one token every 4 seconds
+            assert bucket.reserve() == 4.0
+            
+            bucket.set_rate(1.0)  # Debt is now repaid at the faster rate
+            assert bucket.reserve() == 2.0
+            
+            try:
+                bucket.set_rate(0)
+                assert False, "Should have raised ValueError"
+            except ValueError:
+                pass
+        
+        print("✅ Token bucket set rate test passed")
+    
+    def test_token_bucket_invalid_rate(self):
+        """Test invalid bucket parameters are rejected"""
+        for kwargs in ({'rate': 0}, {'rate': 1, 'capacity': 0.5}):
+            try:
+                TokenBucket(**kwargs)
+                assert False, "Should have raised ValueError"
+            except ValueError:
+                pass
+        print("✅ Token bucket validation test passed")
+
+class TestDuplicateFinder:
+    """Test the existing duplicate finder utility"""
+    
+    def test_near_duplicate_threshold(self):
+        """Test names are reported as near-duplicates only at or above the threshold"""
+        names = [
+            _normalize_name("Habanero Sauce"), _normalize_name("Sweet Habanero Sauce Recipe"),
+            "chocolate chip cookies", "chewy chocolate chip cookies",
+            "garlic hot sauce", "hot sauce wings",
+        ]
+        pairs = _find_near_duplicates(names, NEAR_DUPLICATE_THRESHOLD)
+        
+        # A name plus a qualifier shares 1 of 2 bigrams, exactly the (inclusive) threshold;
+        # sharing 1 of 3 ("hot sauce") is not reported
+        assert pairs == [
+            ("chewy chocolate chip cookies", "chocolate chip cookies", 2 / 3),
+            ("habanero sauce", "sweet habanero sauce", 0.5),
+        ]
+        
+        print("✅ Near-duplicate threshold test passed")
+    
+    def test_near_duplicate_non_matches(self):
+        """Test unrelated names and names that normalize to nothing are never paired"""
+        assert _normalize_name("  Recipe ") == ""
+        assert _normalize_name("Hot  Sauce Recipe") == "hot sauce"
+        
+        names = ["", "chocolate chip cookies", "oatmeal raisin cookies", "cookies", "bread"]
+        assert _find_near_duplicates(names, NEAR_DUPLICATE_THRESHOLD) == []
+        assert _find_near_duplicates([], NEAR_DUPLICATE_THRESHOLD) == []
+        
+        print("✅ Near-duplicate non-match test passed")
+    
+    def test_recipe_pages_fetched_concurrently(self):
+        """Test every listing page is fetched once and recipes from all pages are analyzed"""
+        # 250 reported recipes, but 10 were deleted before the last page was fetched
+        recipes = [{'id': i, 'name': f"Dish {i}"} for i in range(240)]
+        recipes[5]['name'] = recipes[205]['name'] = "Hot Sauce"
+        
+        def fake_get(url, timeout):
+            page = int(url.split('page=')[1].split('&')[0])
+            return mock_json_response({'count': 250, 'results': recipes[(page - 1) * 100:page * 100]})
+        
+        session = MagicMock()
+        session.get.side_effect = fake_get
+        
+        with patch('find_existing_duplicates.load_config', return_value=("https://test.com", "token", 30)), \
+             patch('find_existing_duplicates.create_session', return_value=session), \
+             patch('builtins.print') as mock_print:
+            find_existing_duplicates()
+        
+        requested_pages = sorted(int(call.args[0].split('page=')[1].split('&')[0])
+                                 for call in session.get.call_args_list)
+        assert requested_pages == [1, 2, 3]
+        
+        printed = [call.args[0] for call in mock_print.call_args_list if call.args]
+        assert "📊 Total recipes in database: 240" in printed
+        assert "\n🚨 Potential duplicates for: 'Hot Sauce'" in printed
+        assert "   Duplicate groups found: 1" in printed
+        
+        print("✅ Concurrent recipe page fetch test passed")
 
 class TestExceptionHandling:
     """Test custom exception handling"""
@@ -392,6 +1093,7 @@ def run_all_tests():
     config_tests.test_missing_config_file()
     config_tests.test_invalid_url_format()
     config_tests.test_placeholder_values()
+    config_tests.test_config_is_cached()
     
     # Importer tests
     print("\n🔧 Testing Importer Functionality:")
@@ -400,6 +1102,16 @@ def run_all_tests():
     importer_tests.test_initialization_with_output_file()
     importer_tests.test_log_output_console_only()
     importer_tests.test_log_output_with_file()
+    importer_tests.test_log_output_flushes_only_on_request()
+    importer_tests.test_import_uses_prefetched_scrape()
+    importer_tests.test_scrape_failures_classified_by_tag()
+    importer_tests.test_enhanced_name_duplicate_counted_once()
+    importer_tests.test_prefetch_runs_name_check()
+    importer_tests.test_prefetch_logs_replayed_and_enhancement_deferred()
+    importer_tests.test_name_index_used_for_duplicate_checks()
+    importer_tests.test_fallback_name_from_url()
+    importer_tests.test_enhance_duplicate_skips_fetch_when_listing_has_image()
+    importer_tests.test_recipe_quality_validation()
     
     # URL validation tests
     print("\n🌐 Testing URL Validation:")
@@ -407,11 +1119,14 @@ def run_all_tests():
     url_tests.test_valid_recipe_urls()
     url_tests.test_invalid_urls()
     url_tests.test_edge_cases()
+    url_tests.test_url_duplicate_detection()
     
     # File operation tests
     print("\n📁 Testing File Operations:")
     file_tests = TestFileOperations()
     file_tests.test_file_reading_success()
+    file_tests.test_repeated_urls_imported_once()
+    file_tests.test_pacing_recovers_additively_after_rate_limit()
     file_tests.test_file_not_found()
     file_tests.test_file_too_large()
     
@@ -419,8 +1134,33 @@ def run_all_tests():
     print("\n🌐 Testing Network Operations:")
     network_tests = TestNetworkOperations()
     network_tests.test_network_retry_logic()
+    network_tests.test_source_url_cache()
+    network_tests.test_source_urls_from_listing()
+    network_tests.test_source_url_pages_fetched_concurrently()
+    network_tests.test_source_url_fetch_timeout_skips_pending_pages()
+    network_tests.test_rate_limited_detail_retried_after_cooldown()
+    network_tests.test_recipe_fetch_cached_until_image_upload()
+    network_tests.test_rate_limit_reset_honors_retry_after()
     network_tests.test_authentication_error()
     network_tests.test_image_upload_functionality()
+    network_tests.test_failed_background_image_uploads_counted()
+    network_tests.test_create_failure_reports_body_prefix()
+    network_tests.test_session_connection_pool()
+    network_tests.test_json_body_round_trip()
+    
+    # Rate limiter tests
+    print("\n⏳ Testing Rate Limiting:")
+    rate_tests = TestRateLimiter()
+    rate_tests.test_token_bucket_pacing()
+    rate_tests.test_token_bucket_set_rate()
+    rate_tests.test_token_bucket_invalid_rate()
+    
+    # Duplicate finder tests
+    print("\n🔎 Testing Duplicate Finder:")
+    finder_tests = TestDuplicateFinder()
+    finder_tests.test_near_duplicate_threshold()
+    finder_tests.test_near_duplicate_non_matches()
+    finder_tests.test_recipe_pages_fetched_concurrently()
     
     # Exception handling tests
     print("\n🚨 Testing Exception Handling:")